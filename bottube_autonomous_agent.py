@@ -21,36 +21,95 @@ Run as: python3 bottube_autonomous_agent.py [--once]
 Deploy as systemd service on VPS.
 """
 
-import codecs
+import bisect
+import functools
 import hashlib
+import io
 import json
 import logging
 import math
 import os
 import random
 import re
+import secrets
+import selectors
 import signal
+import socket
 import sqlite3
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+import unicodedata
+import uuid
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from enum import IntEnum
 from pathlib import Path
+from time import time as _now
+from types import MappingProxyType
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# ollama and the BoTTube SDK are imported on first use rather than at
+# startup; each slot holds the module/class, or False once import failed.
+_ollama_lib = None
+_bottube_client_cls = None
+
+
+def _get_ollama():
+    """Return the ollama module, importing it on first call (None if missing)."""
+    global _ollama_lib
+    if _ollama_lib is None:
+        try:
+            import ollama
+        except ImportError:
+            _ollama_lib = False
+        else:
+            _ollama_lib = ollama
+    return _ollama_lib or None
+
+
+def _get_bottube_client_cls():
+    """Return BoTTubeClient, importing it on first call (None if missing)."""
+    global _bottube_client_cls
+    if _bottube_client_cls is None:
+        try:
+            from bottube import BoTTubeClient
+        except ImportError:
+            _bottube_client_cls = False
+        else:
+            _bottube_client_cls = BoTTubeClient
+    return _bottube_client_cls or None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import websocket  # websocket-client, for ComfyUI progress events
+except ImportError:
+    websocket = None
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
 
 try:
-    import ollama as ollama_lib
+    import ahocorasick  # pyahocorasick, for the janitor term scan
 except ImportError:
-    ollama_lib = None
+    ahocorasick = None
 
 try:
-    from bottube import BoTTubeClient
+    from PIL import Image, ImageDraw, ImageFont  # Pillow, for in-process avatars
 except ImportError:
-    BoTTubeClient = None
+    Image = ImageDraw = ImageFont = None
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -58,6 +117,7 @@ except ImportError:
 
 BASE_URL = os.environ.get("BOTTUBE_URL", "https://bottube.ai")
 COMFYUI_URL = os.environ.get("COMFYUI_URL", "http://192.168.0.133:8188")
+COMFYUI_USE_WS = os.environ.get("COMFYUI_USE_WS", "1") != "0"  # 0 = history polling only
 LOG_LEVEL = os.environ.get("BOTTUBE_LOG_LEVEL", "INFO")
 HEALTH_PORT = int(os.environ.get("HEALTH_PORT", "9200"))
 STATE_DB_PATH = os.environ.get("BOTTUBE_STATE_DB",
@@ -78,20 +138,32 @@ _LLM_BACKENDS_RAW = [
         "model": os.environ.get("LLM_FALLBACK_MODEL", "qwen2.5:14b"),
     },
 ]
-# Deduplicate by (url, model) and auto-generate labels from URL
-_seen = set()
-LLM_BACKENDS = []
-for _b in _LLM_BACKENDS_RAW:
-    _key = (_b["url"], _b["model"])
-    if _key not in _seen:
-        _seen.add(_key)
-        _host = _b["url"].replace("http://", "").replace("https://", "").split(":")[0]
-        if _host in ("localhost", "127.0.0.1"):
-            _b["label"] = f"local/{_b['model']}"
-        else:
-            _b["label"] = f"{_host}/{_b['model']}"
-        LLM_BACKENDS.append(_b)
-del _seen, _LLM_BACKENDS_RAW
+
+
+# Host part of a backend URL; the scheme is optional so that a bare
+# "host:port" in LLM_*_URL still yields a sensible label.
+_HOST_RE = re.compile(r"^(?:https?://)?([^:/]+)")
+
+
+def _backend_label(backend):
+    """Short log label for a backend, e.g. ``local/qwen2.5:3b``."""
+    m = _HOST_RE.match(backend["url"])
+    host = m.group(1) if m else backend["url"]
+    if host in ("localhost", "127.0.0.1"):
+        return f"local/{backend['model']}"
+    return f"{host}/{backend['model']}"
+
+
+# Deduplicate by (url, model); dict keys keep first-seen order
+LLM_BACKENDS = list({
+    (_b["url"], _b["model"]): {**_b, "label": _backend_label(_b)}
+    for _b in _LLM_BACKENDS_RAW
+}.values())
+del _LLM_BACKENDS_RAW
+
+# How long Ollama keeps the tool-calling model (and its prompt KV cache)
+# resident between smart-bot turns
+LLM_KEEP_ALIVE = os.environ.get("LLM_KEEP_ALIVE", "30m")
 
 # Global rate controls
 MAX_ACTIONS_PER_HOUR = 30
@@ -102,17 +174,24 @@ MAX_VIDEOS_PER_DAY = 6
 BURST_THRESHOLD = 15
 BURST_COOLDOWN_SEC = 7200
 MAX_API_CALLS_PER_SMART_CYCLE = 15
+# Smart cycles run side by side, up to this many at once; keep it at or
+# below the LLM server's OLLAMA_NUM_PARALLEL (1 = one bot at a time)
+SMART_CYCLE_WORKERS = int(os.environ.get("SMART_CYCLE_WORKERS", "2"))
 MAX_BOTS_PER_VIDEO = 5            # Max distinct bots commenting on one video
 MAX_REPLY_CHAIN_DEPTH = 2         # Max back-and-forth replies between two bots
 VIDEO_REPLY_COOLDOWN_SEC = 3600   # 1hr min between any bot replying on same video
 
-# Font path for ffmpeg drawtext
+# Font for ffmpeg text cards (rendered by libass; FONT_NAME is the family
+# it looks up in FONT_PATH's directory)
 if Path("/System/Library/Fonts/Helvetica.ttc").exists():
     FONT_PATH = "/System/Library/Fonts/Helvetica.ttc"
+    FONT_NAME = "Helvetica"
 elif Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf").exists():
     FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    FONT_NAME = "DejaVu Sans"
 else:
     FONT_PATH = ""
+    FONT_NAME = ""
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -133,6 +212,34 @@ logging.basicConfig(
 )
 log = logging.getLogger("bottube-daemon")
 
+# str.translate tables: control characters (C0 + DEL) stripped from log
+# lines; for ASS text also drop the override-block/escape characters
+_CTRL_TABLE = dict.fromkeys([*range(0x20), 0x7f])
+_ASS_TEXT_TABLE = {**_CTRL_TABLE, **dict.fromkeys(map(ord, "{}\\"))}
+
+# JSON for LLM payloads and tool results: orjson when installed (returns
+# bytes, parses bytes directly), otherwise the stdlib with matching compact,
+# non-ASCII output. _json_dumps returns str for message content.
+if orjson is not None:
+    _json_dumpb = orjson.dumps
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+else:
+    _json_dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
+    def _json_dumpb(obj):
+        return _json_dumps(obj).encode()
+    _json_loads = json.loads
+
+# One pooled session for outbound HTTP so repeat calls to the same host
+# (LLM backends, ComfyUI, BoTTube) reuse keep-alive connections.
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
 # ---------------------------------------------------------------------------
 # Bot Definitions — API keys, personality profiles, tiers
 # ---------------------------------------------------------------------------
@@ -445,6 +552,53 @@ BOT_PROFILES = {
     },
 }
 
+# Profiles are fixed after import: prompt lists become tuples and the
+# top-level mapping is read-only. (init_bots may still fill in an api_key
+# on the per-bot dict for bots registered at startup.)
+for _profile in BOT_PROFILES.values():
+    _profile["video_prompts"] = tuple(_profile["video_prompts"])
+BOT_PROFILES = MappingProxyType(BOT_PROFILES)
+
+# Per-bot X-API-Key headers, built (and sanity-checked) once at import.
+# These dicts are shared across requests — pass them as-is, never mutate.
+_API_KEY_RE = re.compile(r"bottube_sk_[0-9a-f]{48}")
+AUTH_HEADERS = {}
+for _name, _profile in BOT_PROFILES.items():
+    if not _profile["api_key"]:
+        continue
+    if not _API_KEY_RE.fullmatch(_profile["api_key"]):
+        log.warning("API key for %s does not look like a BoTTube key", _name)
+    AUTH_HEADERS[_name] = {"X-API-Key": _profile["api_key"]}
+del _name, _profile
+
+# Our own agent names, for "is this one of ours?" checks in feed loops
+# (a plain frozenset avoids the MappingProxyType indirection per lookup).
+_BOT_NAME_SET = frozenset(BOT_PROFILES)
+
+
+class Activity(IntEnum):
+    """Bot activity level; doubles as an index into the ACTIVITY_* tables."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+
+ACTIVITY_WAKE_SCALE = (2.0, 1.5, 1.0)          # mean-interval multiplier
+ACTIVITY_VIDEO_CHANCE = (0.003, 0.01, 0.02)    # per-wake video generation odds
+
+# Wake-scheduling constants, laid out as parallel tuples indexed by
+# BOT_INDEX[name] so the scheduler reads plain floats instead of walking
+# each profile dict on every wake.
+BOT_IDS = tuple(BOT_PROFILES)
+BOT_INDEX = {name: i for i, name in enumerate(BOT_IDS)}
+BOT_WAKE_MEAN = tuple(
+    (p["base_interval_min"] + p["base_interval_max"]) / 2
+    * ACTIVITY_WAKE_SCALE[Activity[p["activity"].upper()]]
+    for p in BOT_PROFILES.values()
+)
+BOT_WAKE_FLOOR = tuple(p["base_interval_min"] * 0.5 for p in BOT_PROFILES.values())
+BOT_WAKE_CEIL = tuple(p["base_interval_max"] * 1.5 for p in BOT_PROFILES.values())
+
 # ---------------------------------------------------------------------------
 # Bot Personality Prompts (for LLM comment generation)
 # ---------------------------------------------------------------------------
@@ -574,6 +728,7 @@ BOT_PERSONALITIES = {
         "You sign off comments with '\u2014 SkyWatch AI'"
     ),
 }
+BOT_PERSONALITIES = MappingProxyType(BOT_PERSONALITIES)
 
 # ---------------------------------------------------------------------------
 # rot13 Easter Eggs — ~30% of comments include hidden messages
@@ -686,6 +841,27 @@ _ROT13_TAGS = {
     "skywatch_ai": "ATMOSPHERIC_WHISPER",
 }
 
+# ROT13 decode table and the decoded easter eggs, built once at import.
+# Posts keep the encoded form (that's the easter egg); the plaintext is
+# only for logging.
+_ROT13_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+    "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm",
+)
+_ROT13_PLAINTEXT = {
+    bot: tuple(m.translate(_ROT13_TABLE) for m in msgs)
+    for bot, msgs in ROT13_MESSAGES.items()
+}
+
+# Per-bot (tag prefix, encoded messages, plaintext) so _rot13_tag does one
+# lookup and no formatting.
+_TAG_AND_MSGS = {
+    bot: (f"\n\n[{_ROT13_TAGS.get(bot, 'HIDDEN_MESSAGE')}: ", tuple(msgs),
+          _ROT13_PLAINTEXT[bot])
+    for bot, msgs in ROT13_MESSAGES.items()
+}
+_TAG_AND_MSGS_DEFAULT = ("\n\n[HIDDEN_MESSAGE: ", ("V nz urer",), ("I am here",))
+
 # Video title/description templates
 VIDEO_TITLES = {
     "sophia-elya": [
@@ -786,13 +962,40 @@ VIDEO_TITLES = {
 # ---------------------------------------------------------------------------
 
 _db_lock = threading.Lock()
+_db_tls = threading.local()
+
+# In-memory view of recent comments, seeded from the DB by _init_db and kept
+# current by _db_record_action: a sliding one-hour window of timestamps per
+# bot (see _comments_this_hour) and {video_id: ts} within the same-video
+# cooldown (see _already_commented).
+_comment_windows = {}
+_comment_windows_lock = threading.Lock()  # guards both maps across bot threads
+_recent_comments = {}
+_RECENT_COMMENTS_PRUNE_AT = 512
+
+# Bot actions are queued in memory and written in batches by a background
+# flusher; readers of bot_actions flush first so they see their own writes.
+_ACTION_FLUSH_INTERVAL_SEC = 0.5
+_ACTION_FLUSH_THRESHOLD = 64
+_LLM_CACHE_PRUNE_INTERVAL_SEC = 3600  # flusher drops expired llm_cache rows this often
+_pending_actions = deque()
+_action_flush_now = threading.Event()
+_action_flusher = None
+# (bot_name, action_type) -> (expires_at, window_sec, frozenset of hashes);
+# see _db_covered_hashes
+_COVERED_CACHE_TTL_SEC = 300
+_covered_cache = {}
+
+_INSERT_ACTION_SQL = (
+    "INSERT INTO bot_actions (bot_name, action_type, video_id, target_agent, timestamp, comment_text) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
 
 
 def _init_db():
     """Initialize the state database."""
     Path(STATE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(STATE_DB_PATH)
-    conn.execute("PRAGMA journal_mode=WAL")
+    conn = _db_conn()
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS bot_state (
             bot_name TEXT PRIMARY KEY,
@@ -815,6 +1018,8 @@ def _init_db():
             ON bot_actions(bot_name, video_id);
         CREATE INDEX IF NOT EXISTS idx_actions_ts
             ON bot_actions(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_actions_bot_type_ts
+            ON bot_actions(bot_name, action_type, timestamp);
         CREATE TABLE IF NOT EXISTS known_videos (
             video_id TEXT PRIMARY KEY,
             first_seen REAL NOT NULL
@@ -825,144 +1030,269 @@ def _init_db():
             replied_at REAL NOT NULL,
             PRIMARY KEY (bot_name, comment_id)
         );
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS bot_avatars (
+            bot_name TEXT PRIMARY KEY,
+            uploaded_at REAL NOT NULL
+        );
     """)
-    conn.commit()
-    conn.close()
+    now = _now()
+    _db_llm_cache_prune()
+    rows = conn.execute(
+        "SELECT bot_name, video_id, timestamp FROM bot_actions "
+        "WHERE action_type='comment' AND timestamp>? ORDER BY timestamp",
+        (now - SAME_VIDEO_COOLDOWN_SEC,),
+    ).fetchall()
+    for bot_name, video_id, ts in rows:
+        _recent_comments.setdefault(bot_name, {})[video_id] = ts
+        if ts > now - 3600:
+            _comment_windows.setdefault(bot_name, deque()).append(ts)
+    _start_action_flusher()
     log.info("State DB initialized: %s", STATE_DB_PATH)
 
 
 def _db_conn():
-    """Get a thread-local DB connection."""
-    return sqlite3.connect(STATE_DB_PATH)
+    """Get this thread's DB connection, opening it on first use.
+
+    Each thread keeps one WAL-mode connection (and its prepared-statement
+    cache) for its lifetime; writers still serialize through _db_lock.
+    """
+    conn = getattr(_db_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(STATE_DB_PATH, check_same_thread=False,
+                               cached_statements=128)
+        conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+        )
+        _db_tls.conn = conn
+    return conn
+
+
+def _db_read_conn():
+    """Get this thread's read-only DB connection.
+
+    Lookups go through it without taking _db_lock: in WAL mode readers see
+    the last committed state and never wait on (or block) the writer.
+    """
+    conn = getattr(_db_tls, "read_conn", None)
+    if conn is None:
+        conn = sqlite3.connect(f"{Path(STATE_DB_PATH).resolve().as_uri()}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=128)
+        _db_tls.read_conn = conn
+    return conn
 
 
 def _db_record_action(bot_name, action_type, video_id="", target_agent="", comment_text=""):
-    """Record a bot action to the DB."""
+    """Queue a bot action for the DB (written by the background flusher)."""
+    now = _now()
+    _pending_actions.append((bot_name, action_type, video_id, target_agent, now, comment_text))
+    if action_type == "comment":
+        with _comment_windows_lock:
+            _comment_windows.setdefault(bot_name, deque()).append(now)
+            recent = _recent_comments.setdefault(bot_name, {})
+            recent[video_id] = now
+            if len(recent) >= _RECENT_COMMENTS_PRUNE_AT:
+                cutoff = now - SAME_VIDEO_COOLDOWN_SEC
+                _recent_comments[bot_name] = {v: ts for v, ts in recent.items() if ts > cutoff}
+    elif comment_text and _covered_cache:
+        cached = _covered_cache.get((bot_name, action_type))
+        if cached:
+            expires_at, window_sec, covered = cached
+            _covered_cache[(bot_name, action_type)] = (expires_at, window_sec,
+                                                       covered | {comment_text})
+    if len(_pending_actions) >= _ACTION_FLUSH_THRESHOLD:
+        _action_flush_now.set()
+
+
+def _flush_pending_actions():
+    """Write all queued bot actions in a single transaction."""
+    if not _pending_actions:
+        return
     with _db_lock:
+        batch = []
+        while _pending_actions:
+            batch.append(_pending_actions.popleft())
         conn = _db_conn()
         try:
-            conn.execute(
-                "INSERT INTO bot_actions (bot_name, action_type, video_id, target_agent, timestamp, comment_text) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (bot_name, action_type, video_id, target_agent, time.time(), comment_text),
-            )
+            conn.executemany(_INSERT_ACTION_SQL, batch)
             conn.commit()
-        finally:
-            conn.close()
+        except sqlite3.Error:
+            # These rows back the dedup/cooldown checks; keep them (ahead of
+            # anything queued meanwhile) for the next flush instead of dropping.
+            conn.rollback()
+            _pending_actions.extendleft(reversed(batch))
+            raise
+
+
+def _action_flush_loop():
+    next_prune = _now() + _LLM_CACHE_PRUNE_INTERVAL_SEC
+    while True:
+        _action_flush_now.wait(_ACTION_FLUSH_INTERVAL_SEC)
+        _action_flush_now.clear()
+        try:
+            _flush_pending_actions()
+            if _now() >= next_prune:
+                next_prune = _now() + _LLM_CACHE_PRUNE_INTERVAL_SEC
+                _db_llm_cache_prune()
+        except sqlite3.Error as e:
+            log.warning("Action flush failed: %s", e)
 
 
-def _db_already_commented(bot_name, video_id, cooldown=SAME_VIDEO_COOLDOWN_SEC):
-    """Check if bot already commented on video within cooldown."""
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT 1 FROM bot_actions WHERE bot_name=? AND video_id=? "
-                "AND action_type='comment' AND timestamp>?",
-                (bot_name, video_id, time.time() - cooldown),
-            ).fetchone()
-            return row is not None
-        finally:
-            conn.close()
+def _start_action_flusher():
+    """Start the background action flusher (once)."""
+    global _action_flusher
+    if _action_flusher is None:
+        _action_flusher = threading.Thread(target=_action_flush_loop, daemon=True,
+                                           name="db-flush")
+        _action_flusher.start()
 
 
-def _db_comments_this_hour(bot_name):
+def _already_commented(bot_name, video_id, cooldown=SAME_VIDEO_COOLDOWN_SEC):
+    """Check if bot already commented on video within cooldown.
+
+    Only remembers SAME_VIDEO_COOLDOWN_SEC of history, so longer cooldowns
+    are capped at that.
+    """
+    with _comment_windows_lock:
+        ts = _recent_comments.get(bot_name, {}).get(video_id)
+    return ts is not None and ts > _now() - cooldown
+
+
+def _comments_this_hour(bot_name):
     """Count comments by this bot in the last hour."""
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT COUNT(*) FROM bot_actions WHERE bot_name=? "
-                "AND action_type='comment' AND timestamp>?",
-                (bot_name, time.time() - 3600),
-            ).fetchone()
-            return row[0] if row else 0
-        finally:
-            conn.close()
+    cutoff = _now() - 3600
+    with _comment_windows_lock:
+        window = _comment_windows.get(bot_name)
+        if not window:
+            return 0
+        while window and window[0] <= cutoff:
+            window.popleft()
+        return len(window)
+
+
+def _db_covered_hashes(bot_name, action_type, window_sec):
+    """Hashes (stored in comment_text) a bot recorded for action_type within
+    window_sec. Cached for a few minutes; recording a matching action adds
+    its hash to the cached set instead of forcing a rescan."""
+    key = (bot_name, action_type)
+    now = _now()
+    cached = _covered_cache.get(key)
+    if cached and cached[0] > now and cached[1] == window_sec:
+        return cached[2]
+    _flush_pending_actions()
+    conn = _db_read_conn()
+    rows = conn.execute(
+        "SELECT comment_text FROM bot_actions "
+        "WHERE bot_name=? AND action_type=? AND timestamp>?",
+        (bot_name, action_type, now - window_sec),
+    ).fetchall()
+    covered = frozenset(row[0] for row in rows if row[0])
+    _covered_cache[key] = (now + _COVERED_CACHE_TTL_SEC, window_sec, covered)
+    return covered
 
 
 def _db_already_replied_to_comment(bot_name, comment_id):
     """Check if bot already replied to this comment."""
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT 1 FROM comment_replies WHERE bot_name=? AND comment_id=?",
-                (bot_name, comment_id),
-            ).fetchone()
-            return row is not None
-        finally:
-            conn.close()
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT 1 FROM comment_replies WHERE bot_name=? AND comment_id=?",
+        (bot_name, comment_id),
+    ).fetchone()
+    return row is not None
 
 
 def _db_record_reply(bot_name, comment_id):
     """Record that bot replied to a comment."""
     with _db_lock:
         conn = _db_conn()
-        try:
-            conn.execute(
-                "INSERT OR IGNORE INTO comment_replies (bot_name, comment_id, replied_at) "
-                "VALUES (?, ?, ?)",
-                (bot_name, comment_id, time.time()),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        conn.execute(
+            "INSERT OR IGNORE INTO comment_replies (bot_name, comment_id, replied_at) "
+            "VALUES (?, ?, ?)",
+            (bot_name, comment_id, _now()),
+        )
+        conn.commit()
 
 
 def _db_bots_on_video(video_id):
     """Count distinct bots that have commented on a video in the last 24h."""
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT COUNT(DISTINCT bot_name) FROM bot_actions "
-                "WHERE video_id=? AND action_type IN ('comment','reply') AND timestamp>?",
-                (video_id, time.time() - 86400),
-            ).fetchone()
-            return row[0] if row else 0
-        finally:
-            conn.close()
+    _flush_pending_actions()
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT COUNT(DISTINCT bot_name) FROM bot_actions "
+        "WHERE video_id=? AND action_type IN ('comment','reply') AND timestamp>?",
+        (video_id, _now() - 86400),
+    ).fetchone()
+    return row[0] if row else 0
 
 
 def _db_reply_chain_depth(bot_name, target_bot, video_id):
     """Count back-and-forth replies between two bots on a video in the last 24h."""
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT COUNT(*) FROM bot_actions "
-                "WHERE video_id=? AND action_type='reply' AND timestamp>? "
-                "AND ((bot_name=? AND target_agent=?) OR (bot_name=? AND target_agent=?))",
-                (video_id, time.time() - 86400, bot_name, target_bot, target_bot, bot_name),
-            ).fetchone()
-            return row[0] if row else 0
-        finally:
-            conn.close()
+    _flush_pending_actions()
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT COUNT(*) FROM bot_actions "
+        "WHERE video_id=? AND action_type='reply' AND timestamp>? "
+        "AND ((bot_name=? AND target_agent=?) OR (bot_name=? AND target_agent=?))",
+        (video_id, _now() - 86400, bot_name, target_bot, target_bot, bot_name),
+    ).fetchone()
+    return row[0] if row else 0
 
 
 def _db_recent_reply_on_video(video_id, cooldown=VIDEO_REPLY_COOLDOWN_SEC):
     """Check if ANY managed bot replied on this video within the cooldown period."""
+    _flush_pending_actions()
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT 1 FROM bot_actions WHERE video_id=? "
+        "AND action_type IN ('comment','reply') AND timestamp>?",
+        (video_id, _now() - cooldown),
+    ).fetchone()
+    return row is not None
+
+
+def _db_llm_cache_get(cache_key):
+    """Return a cached LLM response, or None if missing/expired."""
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT response FROM llm_cache WHERE cache_key=? AND expires_at>?",
+        (cache_key, _now()),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _db_llm_cache_put(cache_key, response, ttl):
+    """Store an LLM response for ttl seconds."""
     with _db_lock:
         conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT 1 FROM bot_actions WHERE video_id=? "
-                "AND action_type IN ('comment','reply') AND timestamp>?",
-                (video_id, time.time() - cooldown),
-            ).fetchone()
-            return row is not None
-        finally:
-            conn.close()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (cache_key, response, expires_at) "
+            "VALUES (?, ?, ?)",
+            (cache_key, response, _now() + ttl),
+        )
+        conn.commit()
+
+
+def _db_llm_cache_prune():
+    """Delete expired LLM cache rows (at startup and hourly from the flusher)."""
+    with _db_lock:
+        conn = _db_conn()
+        conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (_now(),))
+        conn.commit()
 
 
 def _filter_non_english(text):
     """Strip Cyrillic, CJK, and other non-Latin characters from LLM output.
     Falls back to a safe English string if too little remains."""
-    import unicodedata
+    category = unicodedata.category
     cleaned = []
     for ch in text:
-        cat = unicodedata.category(ch)
+        cat = category(ch)
         # Keep: ASCII, Latin Extended, punctuation, symbols, digits, whitespace
         if ord(ch) < 0x0250 or cat.startswith(('P', 'S', 'Z', 'N')):
             cleaned.append(ch)
@@ -973,64 +1303,67 @@ def _filter_non_english(text):
     return result
 
 
-def _db_save_bot_state(bot_name, **kwargs):
-    """Save bot state fields."""
+def _db_save_bot_states(brains):
+    """Save state for several bots in a single transaction."""
     with _db_lock:
         conn = _db_conn()
-        try:
-            conn.execute(
-                "INSERT OR REPLACE INTO bot_state (bot_name, last_action_ts, last_comment_ts, "
-                "last_video_ts, next_wake_ts, videos_uploaded) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (
-                    bot_name,
-                    kwargs.get("last_action_ts", 0),
-                    kwargs.get("last_comment_ts", 0),
-                    kwargs.get("last_video_ts", 0),
-                    kwargs.get("next_wake_ts", 0),
-                    kwargs.get("videos_uploaded", 0),
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        conn.executemany(
+            "INSERT OR REPLACE INTO bot_state (bot_name, last_action_ts, last_comment_ts, "
+            "last_video_ts, next_wake_ts, videos_uploaded) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (b.name, b.last_action_ts, b.last_comment_ts,
+                 b.last_video_ts, b.next_wake_ts, b.videos_uploaded)
+                for b in brains
+            ],
+        )
+        conn.commit()
+
+
+BotState = namedtuple(
+    "BotState", "last_action_ts last_comment_ts last_video_ts next_wake_ts videos_uploaded")
 
 
 def _db_load_bot_state(bot_name):
-    """Load bot state from DB. Returns dict or None."""
+    """Load bot state from DB. Returns a BotState or None."""
+    conn = _db_read_conn()
+    row = conn.execute(
+        "SELECT last_action_ts, last_comment_ts, last_video_ts, next_wake_ts, videos_uploaded "
+        "FROM bot_state WHERE bot_name=?",
+        (bot_name,),
+    ).fetchone()
+    return BotState._make(row) if row else None
+
+
+def _db_avatar_bots():
+    """Names of bots already known to have an uploaded avatar."""
+    conn = _db_read_conn()
+    return {row[0] for row in conn.execute("SELECT bot_name FROM bot_avatars")}
+
+
+def _db_record_avatar(bot_name):
+    """Remember that bot_name has an uploaded avatar (skips the check next start)."""
     with _db_lock:
         conn = _db_conn()
-        try:
-            row = conn.execute(
-                "SELECT last_action_ts, last_comment_ts, last_video_ts, next_wake_ts, videos_uploaded "
-                "FROM bot_state WHERE bot_name=?",
-                (bot_name,),
-            ).fetchone()
-            if row:
-                return {
-                    "last_action_ts": row[0],
-                    "last_comment_ts": row[1],
-                    "last_video_ts": row[2],
-                    "next_wake_ts": row[3],
-                    "videos_uploaded": row[4],
-                }
-        finally:
-            conn.close()
-    return None
+        conn.execute(
+            "INSERT OR REPLACE INTO bot_avatars (bot_name, uploaded_at) VALUES (?, ?)",
+            (bot_name, _now()),
+        )
+        conn.commit()
 
 
-def _db_track_video(video_id):
-    """Track a known valid video ID."""
+def _db_track_videos(video_ids):
+    """Track known valid video IDs in one transaction."""
+    if not video_ids:
+        return
+    now = _now()
     with _db_lock:
         conn = _db_conn()
-        try:
-            conn.execute(
-                "INSERT OR IGNORE INTO known_videos (video_id, first_seen) VALUES (?, ?)",
-                (video_id, time.time()),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        conn.executemany(
+            "INSERT OR IGNORE INTO known_videos (video_id, first_seen) VALUES (?, ?)",
+            [(vid, now) for vid in video_ids],
+        )
+        conn.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -1039,13 +1372,15 @@ def _db_track_video(video_id):
 
 _known_video_ids = set()
 
+# Prefixes LLMs use when they invent video IDs
+_HALLUCINATION_RE = re.compile(r"(?:trending|video|vid_|v10|test|example)", re.IGNORECASE)
+
 
 def _validate_video_id(vid):
     """Check if a video ID looks valid (not hallucinated)."""
     if not vid or not isinstance(vid, str):
         return False, "video_id is required"
-    hallucination_patterns = {"trending", "video", "vid_", "v10", "test", "example"}
-    if any(vid.lower().startswith(p) for p in hallucination_patterns):
+    if _HALLUCINATION_RE.match(vid):
         return False, f"'{vid}' is not a real video ID."
     if _known_video_ids and vid not in _known_video_ids:
         log.warning("Video ID '%s' not in known set (may be stale)", vid)
@@ -1054,11 +1389,11 @@ def _validate_video_id(vid):
 
 def _track_videos_from_response(videos):
     """Track video IDs returned from API responses."""
-    for v in videos:
-        vid = v.get("video_id", "")
-        if vid:
-            _known_video_ids.add(vid)
-            _db_track_video(vid)
+    vids = {vid for v in videos if (vid := v.get("video_id"))}
+    vids -= _known_video_ids
+    if vids:
+        _known_video_ids.update(vids)
+        _db_track_videos(vids)
 
 
 # ---------------------------------------------------------------------------
@@ -1067,94 +1402,287 @@ def _track_videos_from_response(videos):
 
 def _rot13_tag(bot_name):
     """Return a rot13 easter egg string for this bot, or empty."""
-    msg = random.choice(ROT13_MESSAGES.get(bot_name, ["V nz urer"]))
-    tag = _ROT13_TAGS.get(bot_name, "HIDDEN_MESSAGE")
-    return f"\n\n[{tag}: {msg}]"
+    prefix, msgs, plain = _TAG_AND_MSGS.get(bot_name, _TAG_AND_MSGS_DEFAULT)
+    i = random.randrange(len(msgs))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[%s] easter egg: %s", bot_name, plain[i])
+    return prefix + msgs[i] + "]"
+
+
+_ROT13_TAG_CHANCE = 0.30
+
+
+def _maybe_rot13_tag(bot_name):
+    """Return a rot13 easter egg for ~30% of comments, else ""."""
+    if random.random() < _ROT13_TAG_CHANCE:
+        return _rot13_tag(bot_name)
+    return ""
+
+
+# Per-backend failure backoff, keyed by URL. Uses the monotonic clock so
+# wall-clock jumps can't pin a backend down (or release it early).
+_LLM_BACKOFF_MAX_SEC = 60.0
+_backend_failures = {}
+_backend_next_try = {}
+
+
+def _backend_ready(url):
+    """True unless the backend is inside its failure backoff window."""
+    return time.monotonic() >= _backend_next_try.get(url, 0.0)
+
+
+def _mark_backend_failed(url):
+    """Push the backend's next attempt out with jittered exponential backoff."""
+    failures = _backend_failures.get(url, 0) + 1
+    _backend_failures[url] = failures
+    delay = min(_LLM_BACKOFF_MAX_SEC, 2.0 ** failures) * random.uniform(0.5, 1.0)
+    _backend_next_try[url] = time.monotonic() + delay
+
+
+def _mark_backend_ok(url):
+    """Clear any backoff after a successful call."""
+    _backend_failures.pop(url, None)
+    _backend_next_try.pop(url, None)
+
+
+# Rolling (timestamp, latency) samples of successful calls per backend. A
+# backend whose recent p95 exceeds LLM_SLOW_P95_SEC is tried after the faster
+# ones; samples age out after LLM_LATENCY_WINDOW_SEC, so a demoted backend
+# gets traffic again once it has had time to drain.
+LLM_SLOW_P95_SEC = float(os.environ.get("LLM_SLOW_P95_SEC", "30"))
+LLM_LATENCY_WINDOW_SEC = 900
+_backend_latency = {b["url"]: deque(maxlen=64) for b in LLM_BACKENDS}
+_backend_latency_lock = threading.Lock()  # smart cycles record and prune concurrently
+
+
+def _backend_p95(url):
+    """95th-percentile latency (seconds) of recent successful calls, or 0.0."""
+    cutoff = time.monotonic() - LLM_LATENCY_WINDOW_SEC
+    with _backend_latency_lock:
+        samples = _backend_latency.get(url)
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+        if not samples:
+            return 0.0
+        ordered = sorted(latency for _, latency in samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _ready_backends():
+    """Backends outside their failure backoff, saturated ones last."""
+    ready = [b for b in LLM_BACKENDS if _backend_ready(b["url"])]
+    # Stable sort: configured order is kept within the fast and slow groups
+    ready.sort(key=lambda b: _backend_p95(b["url"]) > LLM_SLOW_P95_SEC)
+    return ready
+
+
+@functools.lru_cache(maxsize=64)
+def _system_message_bytes(system_prompt):
+    """UTF-8 JSON for a system message, encoded once per distinct prompt.
+
+    The prompts are bot personalities and a few fixed script prompts, so
+    the same handful of long strings would otherwise be re-serialized on
+    every text completion.
+    """
+    return _json_dumpb({"role": "system", "content": system_prompt})
+
+
+def _chat_request_body(model, system_prompt, user_prompt, max_tokens):
+    """Assemble the /v1/chat/completions body around the cached system message."""
+    return b"".join((
+        b'{"model":', _json_dumpb(model),
+        b',"messages":[', _system_message_bytes(system_prompt), b",",
+        _json_dumpb({"role": "user", "content": user_prompt}),
+        b'],"max_tokens":', str(int(max_tokens)).encode(),
+        b',"temperature":0.95}',
+    ))
 
 
 def _try_ollama_chat(url, model, system_prompt, user_prompt, max_tokens=250):
     """Simple text completion via Ollama /v1/chat/completions."""
     try:
-        r = requests.post(
+        started = time.monotonic()
+        r = _http_session.post(
             f"{url}/v1/chat/completions",
             headers={"Content-Type": "application/json"},
-            json={
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                "max_tokens": max_tokens,
-                "temperature": 0.95,
-            },
+            data=_chat_request_body(model, system_prompt, user_prompt, max_tokens),
             timeout=(5, 90),  # 5s connect timeout, 90s read timeout
         )
-        if r.status_code == 200:
-            text = r.json()["choices"][0]["message"]["content"].strip()
+        if r.status_code >= 500:
+            # Overloaded or crashed model runner: back off like a dead host
+            _mark_backend_failed(url)
+            log.warning("LLM text gen failed (%s): HTTP %s", url, r.status_code)
+        elif r.status_code == 200:
+            finished = time.monotonic()
+            _mark_backend_ok(url)
+            with _backend_latency_lock:
+                _backend_latency[url].append((finished, finished - started))
+            text = _json_loads(r.content)["choices"][0]["message"]["content"].strip()
             if text:
                 return text
-    except requests.ConnectionError:
-        pass
+    except (requests.ConnectionError, requests.Timeout):
+        _mark_backend_failed(url)
     except Exception as e:
         log.warning("LLM text gen failed (%s): %s", url, e)
     return None
 
 
-def _call_llm_text(system_prompt, user_prompt, max_tokens=250):
-    """Generate text via LLM. Tries all backends in order."""
-    for backend in LLM_BACKENDS:
+def _llm_cache_key(*parts):
+    """Stable cache key for an LLM request."""
+    joined = "\x1f".join(str(p) for p in parts).encode()
+    return hashlib.blake2b(joined, digest_size=16).hexdigest()
+
+
+def _call_llm_text(system_prompt, user_prompt, max_tokens=250, cache_ttl=0):
+    """Generate text via LLM. Tries backends in order, skipping any in backoff
+    and trying saturated (slow p95) ones last.
+
+    With cache_ttl > 0 an identical prompt within that window is answered
+    from the state DB instead of the LLM.
+    """
+    cache_key = None
+    if cache_ttl:
+        cache_key = _llm_cache_key(system_prompt, user_prompt, max_tokens)
+        cached = _db_llm_cache_get(cache_key)
+        if cached:
+            return cached
+    for backend in _ready_backends():
         text = _try_ollama_chat(backend["url"], backend["model"],
                                 system_prompt, user_prompt, max_tokens)
         if text:
+            if cache_key:
+                _db_llm_cache_put(cache_key, text, cache_ttl)
             return text
     return None
 
 
+def _normalize_llm_message(response):
+    """Flatten an ollama chat response into a plain assistant message dict."""
+    # Handle both dict (old ollama) and ChatResponse object (ollama v0.6+)
+    if hasattr(response, "message"):
+        raw_msg = response.message
+        msg = {
+            "role": getattr(raw_msg, "role", "assistant"),
+            "content": getattr(raw_msg, "content", "") or "",
+        }
+        raw_tool_calls = getattr(raw_msg, "tool_calls", None) or []
+        if raw_tool_calls:
+            msg["tool_calls"] = [
+                {"function": {"name": tc.function.name, "arguments": tc.function.arguments}}
+                for tc in raw_tool_calls
+            ]
+        return msg
+    msg = response.get("message", {})
+    if "role" not in msg:
+        msg["role"] = "assistant"
+    return msg
+
+
+# httpx timeouts for ollama clients: (connect, read, write, pool)
+_OLLAMA_TOOL_TIMEOUT = (3.0, 150.0, 30.0, 5.0)
+_OLLAMA_WARMUP_TIMEOUT = (5.0, 60.0, 10.0, 5.0)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ollama_client(url, timeout=_OLLAMA_TOOL_TIMEOUT):
+    """Return a shared ollama Client for a backend, so its httpx pool is reused."""
+    import httpx  # ships with the ollama package
+    connect, read, write, pool = timeout
+    return _get_ollama().Client(
+        host=url,
+        timeout=httpx.Timeout(connect=connect, read=read, write=write, pool=pool),
+    )
+
+
+def _note_ollama_error(url, error):
+    """Back off a backend after an ollama client error it didn't answer.
+
+    A 4xx ResponseError means the server replied (bad model, bad request),
+    so the backend itself is up; a 5xx or anything transport-level backs off.
+    """
+    if (isinstance(error, getattr(_get_ollama(), "ResponseError", ()))
+            and getattr(error, "status_code", 500) < 500):
+        _mark_backend_ok(url)
+    else:
+        _mark_backend_failed(url)
+
+
+# id(tools) -> (tools, ollama-ready tools). The tuple itself is kept in the
+# value so its id can't be reused while cached.
+_prepared_tool_sets = {}
+
+
+def _prepare_tools(tools):
+    """Return the tools for ollama for a tool-definition tuple.
+
+    ollama's Client.chat validates every tool dict into a pydantic Tool on
+    each call; for a fixed tuple like SMART_TOOLS that is done once here and
+    reused. Lists aren't cached since they may change under us.
+    """
+    cached = _prepared_tool_sets.get(id(tools))
+    if cached is not None:
+        return cached[1]
+    tool_cls = getattr(_get_ollama(), "Tool", None)
+    prepared = [tool_cls.model_validate(t) for t in tools] if tool_cls else list(tools)
+    if isinstance(tools, tuple):
+        _prepared_tool_sets[id(tools)] = (tools, prepared)
+    return prepared
+
+
 def _call_llm_tool(messages, tools):
     """Run a tool-calling LLM chat turn via Ollama native tools.
 
-    Tries each backend in LLM_BACKENDS order (already deduplicated).
-    Returns the ChatResponse object from ollama.
+    Tries backends like _call_llm_text (backoff-aware, slow ones last) and
+    fails fast when every backend is backing off.
+    Returns the assistant message as a plain dict. Turns are never cached:
+    the history carries the current time and live feed/tool results, so
+    no two cycles share a key.
     """
-    if ollama_lib is None:
+    if _get_ollama() is None:
         raise RuntimeError("ollama package not installed — cannot run smart bots")
 
-    import httpx as _httpx
+    tools = _prepare_tools(tools)
+
+    backends = _ready_backends()
+    if not backends:
+        raise RuntimeError("All LLM backends are backing off")
 
     last_error = None
-    for backend in LLM_BACKENDS:
+    for backend in backends:
+        url = backend["url"]
         try:
-            client = ollama_lib.Client(
-                host=backend["url"],
-                timeout=_httpx.Timeout(connect=3.0, read=150.0, write=30.0, pool=5.0),
-            )
+            started = time.monotonic()
+            client = _get_ollama_client(url)
             response = client.chat(
                 model=backend["model"],
                 messages=messages,
                 tools=tools,
                 options={"temperature": 0.8, "num_predict": 512},
+                keep_alive=LLM_KEEP_ALIVE,
             )
-            return response
         except Exception as e:
             last_error = e
+            _note_ollama_error(url, e)
             log.warning("Tool-calling LLM failed (%s): %s: %s",
                         backend["label"], type(e).__name__, e)
+            continue
+        finished = time.monotonic()
+        _mark_backend_ok(url)
+        with _backend_latency_lock:
+            _backend_latency[url].append((finished, finished - started))
+        return _normalize_llm_message(response)
 
     raise last_error or RuntimeError("No LLM backends available")
 
 
 def _warmup_llm():
     """Pre-load the LLM model with a trivial request so tool-calling doesn't cold-start."""
-    if ollama_lib is None:
+    if _get_ollama() is None:
         log.debug("ollama library not available — skipping LLM warm-up")
         return
-    for backend in LLM_BACKENDS:
+    for backend in _ready_backends():
         try:
-            import httpx as _httpx
-            client = ollama_lib.Client(
-                host=backend["url"],
-                timeout=_httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
-            )
+            client = _get_ollama_client(backend["url"], _OLLAMA_WARMUP_TIMEOUT)
             client.chat(
                 model=backend["model"],
                 messages=[{"role": "user", "content": "hi"}],
@@ -1163,14 +1691,30 @@ def _warmup_llm():
             log.info("LLM warm-up OK: %s (%s)", backend["label"], backend["model"])
             return
         except Exception as e:
+            _note_ollama_error(backend["url"], e)
             log.debug("LLM warm-up failed for %s: %s", backend["label"], e)
     log.warning("No LLM backends responded to warm-up")
 
 
+@functools.lru_cache(maxsize=None)
+def _bot_display(bot_name):
+    """Display name for a bot (falls back to the bot name)."""
+    return BOT_PROFILES.get(bot_name, {}).get("display", bot_name)
+
+
+# Fixed part of the comment prompt; only the title/creator vary per call
+_COMMENT_PROMPT_TEMPLATE = (
+    'Write a single comment on the video "{title}" by @{agent}. '
+    "Stay completely in character. Be creative and unique — never repeat yourself. "
+    "Keep it 1-4 sentences. Reference the video title naturally. "
+    "Address the creator as @{agent}."
+)
+_DEFAULT_COMMENT_PERSONALITY = "You are a friendly bot on the BoTTube video platform."
+
+
 def generate_comment(bot_name, video_title, video_agent, context_comments=None):
     """Generate an in-character comment using LLM. ~30% include rot13 easter eggs."""
-    suffix = _rot13_tag(bot_name) if random.random() < 0.30 else ""
-    personality = BOT_PERSONALITIES.get(bot_name, "You are a friendly bot on the BoTTube video platform.")
+    personality = BOT_PERSONALITIES.get(bot_name, _DEFAULT_COMMENT_PERSONALITY)
 
     context_hint = ""
     if context_comments:
@@ -1180,26 +1724,23 @@ def generate_comment(bot_name, video_title, video_agent, context_comments=None):
             + "\n- ".join(snippets)
         )
 
-    user_prompt = (
-        f'Write a single comment on the video "{video_title}" by @{video_agent}. '
-        f"Stay completely in character. Be creative and unique — never repeat yourself. "
-        f"Keep it 1-4 sentences. Reference the video title naturally. "
-        f"Address the creator as @{video_agent}."
-        f"{context_hint}"
-    )
+    user_prompt = _COMMENT_PROMPT_TEMPLATE.format_map(
+        {"title": video_title, "agent": video_agent}) + context_hint
 
+    # Not cached: a comment must be fresh for each video, and a repeat for the
+    # same video is already blocked by the same-video cooldown
     comment = _call_llm_text(personality, user_prompt)
     if comment:
         comment = _filter_non_english(comment) or comment  # strip Cyrillic/CJK
-        return comment + suffix
+        return comment + _maybe_rot13_tag(bot_name)
 
-    display = BOT_PROFILES.get(bot_name, {}).get("display", bot_name)
+    display = _bot_display(bot_name)
     fallbacks = [
         f'Interesting work on "{video_title}", @{video_agent}. - {display}',
         f'@{video_agent}, "{video_title}" caught my attention. Well done.',
         f'"{video_title}" by @{video_agent} — worth the watch.',
     ]
-    return random.choice(fallbacks) + suffix
+    return random.choice(fallbacks) + _maybe_rot13_tag(bot_name)
 
 
 def generate_reply_with_context(bot_name, comment_author, comment_text, video_title=""):
@@ -1218,7 +1759,6 @@ def generate_reply_with_context(bot_name, comment_author, comment_text, video_ti
         if random.random() < 0.20:
             reply += " "
         return reply
-    display = BOT_PROFILES.get(bot_name, {}).get("display", bot_name)
     templates = [
         f"Great point, @{comment_author}! 👏",
         f"Haha, love this @{comment_author}!",
@@ -1236,7 +1776,7 @@ def generate_reply_with_context(bot_name, comment_author, comment_text, video_ti
 # Lean tool set (8 tools) — keeps prompt eval under 35s on qwen2.5:3b.
 # Dispatch handlers for extended tools (like_comment, browse_recent_comments,
 # crosspost_to_moltbook, search_videos) remain for use by active/casual tiers.
-SMART_TOOLS = [
+SMART_TOOLS = (
     {"type": "function", "function": {
         "name": "browse_feed",
         "description": "Browse the BoTTube feed to see recent videos.",
@@ -1294,384 +1834,543 @@ SMART_TOOLS = [
             "reason": {"type": "string", "description": "What you did"}
         }, "required": ["reason"]}
     }},
-]
+)
+
+
+_VIDEO_STATUS_FLAGS = (
+    ("watch", "already_watched"),
+    ("comment", "already_commented"),
+    ("like", "already_liked"),
+)
 
 
 def _format_video_list(videos, session_actions, max_items=10):
-    """Format a list of video dicts into a compact summary."""
+    """Format videos not yet shown this cycle into a compact summary.
+
+    Returns (summary, number of videos skipped as already shown); the shown
+    IDs are remembered in session_actions["surfaced"].
+    """
+    status_sets = [(flag, session_actions[action]) for action, flag in _VIDEO_STATUS_FLAGS]
+    surfaced = session_actions["surfaced"]
     summary = []
-    for v in videos[:max_items]:
+    skipped = 0
+    for v in videos:
         vid = v.get("video_id", "")
-        flags = []
-        if ("watch", vid) in session_actions:
-            flags.append("already_watched")
-        if ("comment", vid) in session_actions:
-            flags.append("already_commented")
-        if ("like", vid) in session_actions:
-            flags.append("already_liked")
-        entry = {
+        if vid in surfaced:
+            skipped += 1
+            continue
+        if len(summary) >= max_items:
+            break
+        surfaced.add(vid)
+        # Every entry carries the same keys (status as one space-separated
+        # string) so the list encodes as a single TOON table
+        summary.append({
             "id": vid,
             "title": v.get("title", ""),
             "creator": v.get("agent_name", ""),
             "views": v.get("views", 0),
             "likes": v.get("likes", 0),
-        }
-        if flags:
-            entry["your_status"] = flags
-        summary.append(entry)
-    return summary
+            "your_status": " ".join(flag for flag, done in status_sets if vid in done),
+        })
+    return summary, skipped
+
+
+def _video_list_result(key, videos, session_actions):
+    """Tool result for a video listing, leaving out videos already shown."""
+    _track_videos_from_response(videos)
+    summary, skipped = _format_video_list(videos, session_actions)
+    result = {key: summary, "count": len(summary)}
+    if skipped:
+        result["already_shown"] = skipped
+        if not summary:
+            result["note"] = "no new results; pick from videos shown earlier"
+    return result
 
 
 def _sanitize_log(text):
     """Remove control chars from text before logging."""
-    return re.sub(r'[\x00-\x1f\x7f]', '', str(text))[:200]
-
+    return str(text)[:200].translate(_CTRL_TABLE)
 
-def dispatch_smart_tool(client, bot_name, name, args, session_actions):
-    """Dispatch a tool call for a smart (Tier 1) bot."""
-    if not isinstance(args, dict):
-        args = {}
-
-    if name == "browse_feed":
-        try:
-            result = client.feed(page=args.get("page", 1))
-            videos = result.get("videos", [])
-            _track_videos_from_response(videos)
-            summary = _format_video_list(videos, session_actions)
-            return json.dumps({"videos": summary, "count": len(summary)})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
 
-    elif name == "browse_trending":
-        try:
-            result = client.trending()
-            videos = result.get("trending", result.get("videos", []))
-            _track_videos_from_response(videos)
-            summary = _format_video_list(videos, session_actions)
-            return json.dumps({"trending": summary})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+# Tool results go back into the model's context every turn, so successful
+# results are encoded as TOON (Token-Oriented Object Notation): "key: value"
+# lines, and lists of flat records as one header plus one CSV-like row each,
+# instead of repeating every key and quote per item.
+_TOON_QUOTE_RE = re.compile(
+    r'^$|^\s|\s$|^-|[,:"\\\[\]{}\n\r\t]|^(?:true|false|null)$'
+    r'|^[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?$|^[+-]?(?:inf(?:inity)?|nan)$',
+    re.IGNORECASE,
+)
 
-    elif name == "watch_video":
-        vid = args.get("video_id", "")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        try:
-            try:
-                client.watch(vid)
-                session_actions.add(("watch", vid))
-                _known_video_ids.add(vid)
-            except Exception:
-                pass
-            video = client.get_video(vid)
-            comments_data = client.get_comments(vid)
-            comments = comments_data.get("comments", [])[:5]
-            creator = video.get("agent_name", "")
-            flags = []
-            if creator == bot_name:
-                flags.append("THIS_IS_YOUR_OWN_VIDEO")
-            if ("comment", vid) in session_actions:
-                flags.append("you_already_commented")
-            result = {
-                "video": {
-                    "id": video.get("video_id", ""),
-                    "title": video.get("title", ""),
-                    "description": video.get("description", ""),
-                    "creator": creator,
-                    "views": video.get("views", 0),
-                    "likes": video.get("likes", 0),
-                },
-                "comments": [
-                    {"author": c.get("agent_name", ""), "text": c.get("content", "")}
-                    for c in comments
-                ],
-            }
-            if flags:
-                result["your_status"] = flags
-            return json.dumps(result)
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "comment_on_video":
-        vid = args.get("video_id", "")
-        comment = args.get("comment", "")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        if not comment:
-            return json.dumps({"error": "comment is required"})
-        # Auto-watch if not already watched (saves an LLM round-trip)
-        if ("watch", vid) not in session_actions:
-            try:
-                client.watch(vid)
-                session_actions.add(("watch", vid))
-                log.info("[%s] Auto-watched %s before commenting", bot_name, vid)
-            except Exception:
-                pass  # Non-fatal — proceed with comment anyway
-        if ("comment", vid) in session_actions:
-            return json.dumps({"ok": True, "skipped": True, "reason": "Already commented on this video."})
-        if _db_already_commented(bot_name, vid):
-            return json.dumps({"ok": True, "skipped": True, "reason": "Already commented on this video recently."})
-        if _db_bots_on_video(vid) >= MAX_BOTS_PER_VIDEO:
-            return json.dumps({"ok": True, "skipped": True, "reason": "Too many bots already commented on this video. Find another one."})
-        comment = comment[:500].strip()
-        comment = _filter_non_english(comment) or comment
-        # Add rot13 easter egg ~30% of time
-        if random.random() < 0.30:
-            comment += _rot13_tag(bot_name)
-        try:
-            client.comment(vid, comment)
-            session_actions.add(("comment", vid))
-            _db_record_action(bot_name, "comment", vid, comment_text=comment)
-            log.info("[%s] Commented on %s: %s", bot_name, vid, _sanitize_log(comment))
-            return json.dumps({"ok": True, "comment": comment[:100]})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "like_video":
-        vid = args.get("video_id", "")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        if ("like", vid) in session_actions:
-            return json.dumps({"ok": True, "skipped": True, "reason": "Already liked."})
-        # Auto-watch before liking
-        if ("watch", vid) not in session_actions:
-            try:
-                client.watch(vid)
-                session_actions.add(("watch", vid))
-            except Exception:
-                pass
-        try:
-            client.like(vid)
-            session_actions.add(("like", vid))
-            _db_record_action(bot_name, "like", vid)
-            return json.dumps({"ok": True, "action": "liked"})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "dislike_video":
-        vid = args.get("video_id", "")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        if ("dislike", vid) in session_actions:
-            return json.dumps({"ok": True, "skipped": True})
-        # Auto-watch before disliking
-        if ("watch", vid) not in session_actions:
-            try:
-                client.watch(vid)
-                session_actions.add(("watch", vid))
-            except Exception:
-                pass
-        try:
-            client.dislike(vid)
-            session_actions.add(("dislike", vid))
-            _db_record_action(bot_name, "dislike", vid)
-            return json.dumps({"ok": True, "action": "disliked"})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "subscribe_to_creator":
-        agent = args.get("agent_name", "") or args.get("agent", "") or args.get("creator", "")
-        if not agent:
-            return json.dumps({"error": "agent_name is required"})
-        if agent == bot_name:
-            return json.dumps({"ok": True, "skipped": True, "reason": "Can't subscribe to yourself."})
-        if ("subscribe", agent) in session_actions:
-            return json.dumps({"ok": True, "skipped": True, "reason": f"Already subscribed to {agent}."})
-        try:
-            client.subscribe(agent)
-            session_actions.add(("subscribe", agent))
-            _db_record_action(bot_name, "subscribe", target_agent=agent)
-            return json.dumps({"ok": True, "action": "subscribed", "agent": agent})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
 
-    elif name == "search_videos":
-        try:
-            result = client.search(args.get("query", ""))
-            videos = result.get("videos", [])
-            _track_videos_from_response(videos)
-            summary = _format_video_list(videos, session_actions)
-            return json.dumps({"results": summary, "count": len(summary)})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "reply_to_comment":
-        vid = args.get("video_id", "")
-        comment_id = args.get("comment_id")
-        reply_text = args.get("reply", "")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        if not comment_id or not reply_text:
-            return json.dumps({"error": "comment_id and reply are required"})
-        if _db_already_replied_to_comment(bot_name, comment_id):
-            return json.dumps({"ok": True, "skipped": True, "reason": "Already replied to this comment."})
-        if _db_bots_on_video(vid) >= MAX_BOTS_PER_VIDEO:
-            return json.dumps({"ok": True, "skipped": True, "reason": "Too many bots on this video. Find another."})
-        reply_text = reply_text[:500].strip()
-        reply_text = _filter_non_english(reply_text) or reply_text
-        try:
-            client.comment(vid, reply_text, parent_id=int(comment_id))
-            _db_record_reply(bot_name, int(comment_id))
-            _db_record_action(bot_name, "reply", vid, comment_text=reply_text)
-            session_actions.add(("reply", str(comment_id)))
-            log.info("[%s] Smart reply on %s: %s", bot_name, vid, _sanitize_log(reply_text))
-            return json.dumps({"ok": True, "reply": reply_text[:100]})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+def _toon_scalar(value):
+    """Encode a primitive, quoting strings that would otherwise be ambiguous."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float) and not math.isfinite(value):
+        return "null"  # json.dumps would emit bare NaN/Infinity
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    text = str(value)
+    if _TOON_QUOTE_RE.search(text):
+        return json.dumps(text, ensure_ascii=False)
+    return text
 
-    elif name == "check_my_notifications":
-        try:
-            count = client.notification_count()
-            if count == 0:
-                return json.dumps({"unread": 0, "notifications": []})
-            notifs = client.notifications(per_page=10)
-            summary = []
-            for n in notifs[:10]:
-                summary.append({
-                    "type": n.get("type", ""),
-                    "from": n.get("from_agent", ""),
-                    "message": n.get("message", "")[:100],
-                    "video_id": n.get("video_id", ""),
-                    "comment_id": n.get("comment_id"),
-                    "is_read": n.get("is_read", False),
-                })
-            try:
-                client.mark_notifications_read()
-            except Exception:
-                pass
-            return json.dumps({"unread": count, "notifications": summary})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
 
-    elif name == "like_comment":
-        comment_id = args.get("comment_id")
-        if not comment_id:
-            return json.dumps({"error": "comment_id is required"})
-        try:
-            client.like_comment(int(comment_id))
-            log.info("[%s] Liked comment %s", bot_name, comment_id)
-            return json.dumps({"ok": True, "action": "liked_comment"})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+def _is_toon_primitive(value):
+    return not isinstance(value, (dict, list, tuple))
 
-    elif name == "browse_recent_comments":
-        try:
-            result = client.recent_comments(limit=args.get("limit", 15))
-            comments = result.get("comments", []) if isinstance(result, dict) else result
-            summary = []
-            for c in comments[:15]:
-                summary.append({
-                    "id": c.get("id"),
-                    "author": c.get("agent_name", ""),
-                    "text": c.get("content", c.get("text", ""))[:100],
-                    "video_id": c.get("video_id", ""),
-                })
-            return json.dumps({"comments": summary, "count": len(summary)})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
-
-    elif name == "crosspost_to_moltbook":
-        vid = args.get("video_id", "")
-        submolt = args.get("submolt", "bottube")
-        ok, err = _validate_video_id(vid)
-        if not ok:
-            return json.dumps({"error": err})
-        try:
-            result = client.crosspost_moltbook(vid, submolt=submolt)
-            log.info("[%s] Cross-posted %s to m/%s", bot_name, vid, submolt)
-            return json.dumps({"ok": True, "submolt": submolt, "result": str(result)[:200]})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
 
-    elif name == "done_for_now":
-        return json.dumps({"done": True, "reason": args.get("reason", "")})
+def _toon_object(obj, depth, out):
+    pad = "  " * depth
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            out.append(f"{pad}{key}:")
+            _toon_object(value, depth + 1, out)
+        elif isinstance(value, (list, tuple)):
+            _toon_array(key, value, depth, out)
+        else:
+            out.append(f"{pad}{key}: {_toon_scalar(value)}")
 
-    return json.dumps({"error": f"Unknown tool: {name}"})
 
+def _toon_array(key, items, depth, out):
+    pad = "  " * depth
+    n = len(items)
+    if all(_is_toon_primitive(i) for i in items):
+        out.append(f"{pad}{key}[{n}]:" + (" " + ",".join(map(_toon_scalar, items)) if n else ""))
+        return
+    first = items[0]
+    if (isinstance(first, dict)
+            and all(isinstance(i, dict) and i.keys() == first.keys()
+                    and all(_is_toon_primitive(v) for v in i.values())
+                    for i in items)):
+        fields = list(first)
+        out.append(f"{pad}{key}[{n}]{{{','.join(fields)}}}:")
+        for i in items:
+            out.append(pad + "  " + ",".join(_toon_scalar(i[f]) for f in fields))
+        return
+    out.append(f"{pad}{key}[{n}]:")
+    for i in items:
+        if isinstance(i, dict) and i:
+            sub = []
+            _toon_object(i, depth + 2, sub)
+            out.append(f"{pad}  - {sub[0].lstrip()}")
+            out.extend(sub[1:])
+        elif isinstance(i, (list, tuple)):
+            out.append(f"{pad}  - [{len(i)}]: " + ",".join(_toon_scalar(v) for v in i))
+        else:
+            out.append(f"{pad}  - {_toon_scalar(i) if _is_toon_primitive(i) else ''}")
 
-def run_smart_cycle(bot_name, client, personality):
-    """Run a full tool-calling cycle for a Tier 1 smart bot."""
-    session_actions = set()
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    system_content = (
-        personality + f"\n\nCurrent time: {now}\n"
-        "You MUST respond ONLY with tool calls. NEVER respond with plain text.\n"
-        "If you have nothing to do, call done_for_now.\n\n"
-        "WORKFLOW — follow these steps using tool calls:\n"
-        "1. Check check_my_notifications first — reply to anyone who commented on your content\n"
-        "2. Call browse_feed or browse_trending to discover videos\n"
-        "3. Pick a video and call comment_on_video with its ID and your comment\n"
-        "4. Optionally call like_video or like_comment on things you enjoy\n"
-        "5. Optionally browse_recent_comments to find conversations to join via reply_to_comment\n"
-        "6. Call done_for_now when finished\n\n"
-        "RULES:\n"
-        "- ONLY use video IDs returned by browse_feed, browse_trending, search_videos, or notifications\n"
-        "- Do NOT comment on your own videos\n"
-        "- Use reply_to_comment to create threaded replies (more engaging than top-level comments)\n"
-        "- Write in English only\n"
-    )
+def _toon_dumps(obj):
+    """Encode a tool-result dict as TOON."""
+    out = []
+    _toon_object(obj, 0, out)
+    return "\n".join(out)
 
-    behaviors = [
-        "Check notifications first, reply to any comments, then browse_feed and comment on a video.",
-        "Call browse_trending, comment on 1-2 videos, like_comment on good replies.",
-        "Check notifications, browse_recent_comments, reply to an interesting conversation.",
-        "Call browse_feed, like and comment on a video, then check notifications.",
-        "Browse_recent_comments, find a conversation to join, reply_to_comment with your thoughts.",
-        "Check notifications first. Then browse_feed with page 2, comment on a hidden gem.",
-        "Call browse_trending, find something interesting, comment, then browse_recent_comments.",
-    ]
-    behavior = random.choice(behaviors)
 
-    messages = [
-        {"role": "system", "content": system_content},
-        {"role": "user", "content": f"Activity cycle. Suggestion: {behavior}"},
-    ]
+# Smart tool handlers, one per tool name. Each returns a JSON-serializable
+# dict; dispatch_smart_tool tags it with a status and _encode_tool_result
+# encodes it once.
 
-    recent_tool_names = []
-    cycle_errors = 0
-    nudged = False
+def _handle_browse_feed(client, bot_name, args, session_actions):
+    """Browse one page of the feed."""
+    try:
+        result = client.feed(page=args.get("page", 1))
+        return _video_list_result("videos", result.get("videos", []), session_actions)
+    except Exception as e:
+        return {"error": str(e)}
 
-    for turn in range(MAX_API_CALLS_PER_SMART_CYCLE):
-        try:
-            response = _call_llm_tool(messages, SMART_TOOLS)
-        except Exception as e:
-            log.error("[%s] LLM tool-calling error: %s", bot_name, e)
-            break
 
-        # Handle both dict (old ollama) and ChatResponse object (ollama v0.6+)
-        if hasattr(response, "message"):
-            raw_msg = response.message
-            msg = {
-                "role": getattr(raw_msg, "role", "assistant"),
-                "content": getattr(raw_msg, "content", "") or "",
-            }
-            raw_tool_calls = getattr(raw_msg, "tool_calls", None) or []
-            if raw_tool_calls:
-                msg["tool_calls"] = [
-                    {"function": {"name": tc.function.name, "arguments": tc.function.arguments}}
-                    for tc in raw_tool_calls
-                ]
-        else:
-            msg = response.get("message", {})
-            if "role" not in msg:
-                msg["role"] = "assistant"
+def _handle_browse_trending(client, bot_name, args, session_actions):
+    """List trending videos."""
+    try:
+        result = client.trending()
+        videos = result.get("trending", result.get("videos", []))
+        return _video_list_result("trending", videos, session_actions)
+    except Exception as e:
+        return {"error": str(e)}
 
-        messages.append(msg)
 
-        tool_calls = msg.get("tool_calls", [])
-        if not tool_calls:
-            content = msg.get("content", "") or ""
-            if content:
-                log.info("[%s] says: %s", bot_name, _sanitize_log(content))
-            # One-time nudge: if no engagement yet, remind LLM to use tools
-            has_engagement = any(a[0] in ("comment", "like", "dislike") for a in session_actions)
-            if turn < 4 and not has_engagement and not nudged:
+def _handle_watch_video(client, bot_name, args, session_actions):
+    """Watch a video and return its details and top comments."""
+    vid = args.get("video_id", "")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    try:
+        try:
+            client.watch(vid)
+            session_actions["watch"].add(vid)
+            _known_video_ids.add(vid)
+        except Exception:
+            pass
+        video = client.get_video(vid)
+        comments_data = client.get_comments(vid)
+        comments = comments_data.get("comments", [])[:5]
+        creator = video.get("agent_name", "")
+        flags = []
+        if creator == bot_name:
+            flags.append("THIS_IS_YOUR_OWN_VIDEO")
+        if vid in session_actions["comment"]:
+            flags.append("you_already_commented")
+        result = {
+            "video": {
+                "id": video.get("video_id", ""),
+                "title": video.get("title", ""),
+                "description": video.get("description", ""),
+                "creator": creator,
+                "views": video.get("views", 0),
+                "likes": video.get("likes", 0),
+            },
+            "comments": [
+                {"author": c.get("agent_name", ""), "text": c.get("content", "")}
+                for c in comments
+            ],
+        }
+        if flags:
+            result["your_status"] = flags
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_comment_on_video(client, bot_name, args, session_actions):
+    """Comment on a video (auto-watches first, respects cooldowns)."""
+    vid = args.get("video_id", "")
+    comment = args.get("comment", "")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    if not comment:
+        return {"error": "comment is required"}
+    # Auto-watch if not already watched (saves an LLM round-trip)
+    if vid not in session_actions["watch"]:
+        try:
+            client.watch(vid)
+            session_actions["watch"].add(vid)
+            log.info("[%s] Auto-watched %s before commenting", bot_name, vid)
+        except Exception:
+            pass  # Non-fatal — proceed with comment anyway
+    if vid in session_actions["comment"]:
+        return {"ok": True, "skipped": True, "reason": "Already commented on this video."}
+    if _already_commented(bot_name, vid):
+        return {"ok": True, "skipped": True, "reason": "Already commented on this video recently."}
+    if _db_bots_on_video(vid) >= MAX_BOTS_PER_VIDEO:
+        return {"ok": True, "skipped": True, "reason": "Too many bots already commented on this video. Find another one."}
+    comment = comment[:500].strip()
+    comment = _filter_non_english(comment) or comment
+    # The comment text comes straight from the tool call (not generate_comment),
+    # so this is its only chance at an easter egg
+    comment += _maybe_rot13_tag(bot_name)
+    try:
+        client.comment(vid, comment)
+        session_actions["comment"].add(vid)
+        _db_record_action(bot_name, "comment", vid, comment_text=comment)
+        log.info("[%s] Commented on %s: %s", bot_name, vid, _sanitize_log(comment))
+        return {"ok": True, "comment": comment[:100]}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_like_video(client, bot_name, args, session_actions):
+    """Like a video (auto-watches first)."""
+    vid = args.get("video_id", "")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    if vid in session_actions["like"]:
+        return {"ok": True, "skipped": True, "reason": "Already liked."}
+    # Auto-watch before liking
+    if vid not in session_actions["watch"]:
+        try:
+            client.watch(vid)
+            session_actions["watch"].add(vid)
+        except Exception:
+            pass
+    try:
+        client.like(vid)
+        session_actions["like"].add(vid)
+        _db_record_action(bot_name, "like", vid)
+        return {"ok": True, "action": "liked"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_dislike_video(client, bot_name, args, session_actions):
+    """Dislike a video (auto-watches first)."""
+    vid = args.get("video_id", "")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    if vid in session_actions["dislike"]:
+        return {"ok": True, "skipped": True}
+    # Auto-watch before disliking
+    if vid not in session_actions["watch"]:
+        try:
+            client.watch(vid)
+            session_actions["watch"].add(vid)
+        except Exception:
+            pass
+    try:
+        client.dislike(vid)
+        session_actions["dislike"].add(vid)
+        _db_record_action(bot_name, "dislike", vid)
+        return {"ok": True, "action": "disliked"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_subscribe_to_creator(client, bot_name, args, session_actions):
+    """Subscribe to another creator."""
+    agent = args.get("agent_name", "") or args.get("agent", "") or args.get("creator", "")
+    if not agent:
+        return {"error": "agent_name is required"}
+    if agent == bot_name:
+        return {"ok": True, "skipped": True, "reason": "Can't subscribe to yourself."}
+    if agent in session_actions["subscribe"]:
+        return {"ok": True, "skipped": True, "reason": f"Already subscribed to {agent}."}
+    try:
+        client.subscribe(agent)
+        session_actions["subscribe"].add(agent)
+        _db_record_action(bot_name, "subscribe", target_agent=agent)
+        return {"ok": True, "action": "subscribed", "agent": agent}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_search_videos(client, bot_name, args, session_actions):
+    """Search videos by query."""
+    try:
+        result = client.search(args.get("query", ""))
+        return _video_list_result("results", result.get("videos", []), session_actions)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_reply_to_comment(client, bot_name, args, session_actions):
+    """Post a threaded reply to a comment."""
+    vid = args.get("video_id", "")
+    comment_id = args.get("comment_id")
+    reply_text = args.get("reply", "")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    if not comment_id or not reply_text:
+        return {"error": "comment_id and reply are required"}
+    if _db_already_replied_to_comment(bot_name, comment_id):
+        return {"ok": True, "skipped": True, "reason": "Already replied to this comment."}
+    if _db_bots_on_video(vid) >= MAX_BOTS_PER_VIDEO:
+        return {"ok": True, "skipped": True, "reason": "Too many bots on this video. Find another."}
+    reply_text = reply_text[:500].strip()
+    reply_text = _filter_non_english(reply_text) or reply_text
+    try:
+        client.comment(vid, reply_text, parent_id=int(comment_id))
+        _db_record_reply(bot_name, int(comment_id))
+        _db_record_action(bot_name, "reply", vid, comment_text=reply_text)
+        session_actions["reply"].add(str(comment_id))
+        log.info("[%s] Smart reply on %s: %s", bot_name, vid, _sanitize_log(reply_text))
+        return {"ok": True, "reply": reply_text[:100]}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_check_my_notifications(client, bot_name, args, session_actions):
+    """Summarize unread notifications and mark them read."""
+    try:
+        count = client.notification_count()
+        if count == 0:
+            return {"unread": 0, "notifications": []}
+        notifs = client.notifications(per_page=10)
+        summary = []
+        for n in notifs[:10]:
+            summary.append({
+                "type": n.get("type", ""),
+                "from": n.get("from_agent", ""),
+                "message": n.get("message", "")[:100],
+                "video_id": n.get("video_id", ""),
+                "comment_id": n.get("comment_id"),
+                "is_read": n.get("is_read", False),
+            })
+        try:
+            client.mark_notifications_read()
+        except Exception:
+            pass
+        return {"unread": count, "notifications": summary}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_like_comment(client, bot_name, args, session_actions):
+    """Like a comment."""
+    comment_id = args.get("comment_id")
+    if not comment_id:
+        return {"error": "comment_id is required"}
+    try:
+        client.like_comment(int(comment_id))
+        log.info("[%s] Liked comment %s", bot_name, comment_id)
+        return {"ok": True, "action": "liked_comment"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_browse_recent_comments(client, bot_name, args, session_actions):
+    """List recent comments across the platform."""
+    try:
+        result = client.recent_comments(limit=args.get("limit", 15))
+        comments = result.get("comments", []) if isinstance(result, dict) else result
+        summary = []
+        for c in comments[:15]:
+            summary.append({
+                "id": c.get("id"),
+                "author": c.get("agent_name", ""),
+                "text": c.get("content", c.get("text", ""))[:100],
+                "video_id": c.get("video_id", ""),
+            })
+        return {"comments": summary, "count": len(summary)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_crosspost_to_moltbook(client, bot_name, args, session_actions):
+    """Cross-post a video to a Moltbook submolt."""
+    vid = args.get("video_id", "")
+    submolt = args.get("submolt", "bottube")
+    ok, err = _validate_video_id(vid)
+    if not ok:
+        return {"error": err}
+    try:
+        result = client.crosspost_moltbook(vid, submolt=submolt)
+        log.info("[%s] Cross-posted %s to m/%s", bot_name, vid, submolt)
+        return {"ok": True, "submolt": submolt, "result": str(result)[:200]}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _handle_done_for_now(client, bot_name, args, session_actions):
+    """End the cycle."""
+    return {"done": True, "reason": args.get("reason", "")}
+
+
+_TOOL_HANDLERS = {
+    "browse_feed": _handle_browse_feed,
+    "browse_trending": _handle_browse_trending,
+    "watch_video": _handle_watch_video,
+    "comment_on_video": _handle_comment_on_video,
+    "like_video": _handle_like_video,
+    "dislike_video": _handle_dislike_video,
+    "subscribe_to_creator": _handle_subscribe_to_creator,
+    "search_videos": _handle_search_videos,
+    "reply_to_comment": _handle_reply_to_comment,
+    "check_my_notifications": _handle_check_my_notifications,
+    "like_comment": _handle_like_comment,
+    "browse_recent_comments": _handle_browse_recent_comments,
+    "crosspost_to_moltbook": _handle_crosspost_to_moltbook,
+    "done_for_now": _handle_done_for_now,
+}
+
+
+def dispatch_smart_tool(client, bot_name, name, args, session_actions):
+    """Dispatch a tool call for a smart (Tier 1) bot.
+
+    Returns (status, result dict) with status "ok", "error" or "done";
+    _encode_tool_result turns it into the tool message content.
+    """
+    if not isinstance(args, dict):
+        args = {}
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return "error", {"error": f"Unknown tool: {name}"}
+    result = handler(client, bot_name, args, session_actions)
+    if "error" in result:
+        return "error", result
+    if result.get("done"):
+        return "done", result
+    return "ok", result
+
+
+def _encode_tool_result(status, result):
+    """Tool message content: TOON for successes, JSON for errors."""
+    if status == "ok":
+        return _toon_dumps(result)
+    return _json_dumps(result)
+
+
+# Fixed part of the smart-bot system prompt (follows the personality). The
+# system message stays byte-identical across cycles so the backend's prompt
+# prefix cache can reuse it; per-cycle details go in the user message.
+_SMART_CYCLE_RULES = (
+    "You MUST respond ONLY with tool calls. NEVER respond with plain text.\n"
+    "If you have nothing to do, call done_for_now.\n\n"
+    "WORKFLOW — follow these steps using tool calls:\n"
+    "1. Check check_my_notifications first — reply to anyone who commented on your content\n"
+    "2. Call browse_feed or browse_trending to discover videos\n"
+    "3. Pick a video and call comment_on_video with its ID and your comment\n"
+    "4. Optionally call like_video or like_comment on things you enjoy\n"
+    "5. Optionally browse_recent_comments to find conversations to join via reply_to_comment\n"
+    "6. Call done_for_now when finished\n\n"
+    "RULES:\n"
+    "- ONLY use video IDs returned by browse_feed, browse_trending, search_videos, or notifications\n"
+    "- Do NOT comment on your own videos\n"
+    "- Use reply_to_comment to create threaded replies (more engaging than top-level comments)\n"
+    "- Write in English only\n"
+    "- Tool results are TOON: `key: value` lines; `name[N]{a,b}:` is a table "
+    "with one comma-separated row per line\n"
+)
+
+_SMART_CYCLE_BEHAVIORS = (
+    "Check notifications first, reply to any comments, then browse_feed and comment on a video.",
+    "Call browse_trending, comment on 1-2 videos, like_comment on good replies.",
+    "Check notifications, browse_recent_comments, reply to an interesting conversation.",
+    "Call browse_feed, like and comment on a video, then check notifications.",
+    "Browse_recent_comments, find a conversation to join, reply_to_comment with your thoughts.",
+    "Check notifications first. Then browse_feed with page 2, comment on a hidden gem.",
+    "Call browse_trending, find something interesting, comment, then browse_recent_comments.",
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _smart_system_prompt(personality):
+    """Static smart-bot system prompt for a personality."""
+    return f"{personality}\n\n{_SMART_CYCLE_RULES}"
+
+
+def run_smart_cycle(bot_name, client, personality):
+    """Run a full tool-calling cycle for a Tier 1 smart bot."""
+    session_actions = defaultdict(set)  # action -> targets acted on this cycle
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    behavior = random.choice(_SMART_CYCLE_BEHAVIORS)
+
+    messages = [
+        {"role": "system", "content": _smart_system_prompt(personality)},
+        {"role": "user", "content": f"Current time: {now}\nActivity cycle. Suggestion: {behavior}"},
+    ]
+
+    recent_tool_names = deque(maxlen=3)  # loop detection window
+    cycle_errors = 0
+    nudged = False
+
+    for turn in range(MAX_API_CALLS_PER_SMART_CYCLE):
+        try:
+            msg = _call_llm_tool(messages, SMART_TOOLS)
+        except Exception as e:
+            log.error("[%s] LLM tool-calling error: %s", bot_name, e)
+            break
+
+        messages.append(msg)
+
+        tool_calls = msg.get("tool_calls", [])
+        if not tool_calls:
+            content = msg.get("content", "") or ""
+            if content:
+                log.info("[%s] says: %s", bot_name, _sanitize_log(content))
+            # One-time nudge: if no engagement yet, remind LLM to use tools
+            has_engagement = any(session_actions[a] for a in ("comment", "like", "dislike"))
+            if turn < 4 and not has_engagement and not nudged:
                 nudged = True
                 messages.append({"role": "user", "content":
                     "You must use tool calls. Pick a video from the results above "
@@ -1687,35 +2386,31 @@ def run_smart_cycle(bot_name, client, personality):
             fn_args = fn.get("arguments", {})
             if isinstance(fn_args, str):
                 try:
-                    fn_args = json.loads(fn_args)
-                except json.JSONDecodeError:
+                    fn_args = _json_loads(fn_args)
+                except ValueError:
                     fn_args = {}
 
             # Loop detection
             recent_tool_names.append(fn_name)
-            if len(recent_tool_names) >= 3 and recent_tool_names[-1] == recent_tool_names[-2] == recent_tool_names[-3]:
+            if len(recent_tool_names) == 3 and recent_tool_names.count(fn_name) == 3:
                 log.warning("[%s] Loop detected: %s 3x, ending", bot_name, fn_name)
                 return
 
-            log.info("[%s] Tool: %s(%s)", bot_name, fn_name, json.dumps(fn_args)[:100])
-            result = dispatch_smart_tool(client, bot_name, fn_name, fn_args, session_actions)
-
-            try:
-                result_data = json.loads(result)
-                if result_data.get("done"):
-                    log.info("[%s] Cycle complete: %s", bot_name, result_data.get("reason", ""))
+            log.info("[%s] Tool: %s(%s)", bot_name, fn_name, _json_dumps(fn_args)[:100])
+            status, result = dispatch_smart_tool(client, bot_name, fn_name, fn_args,
+                                                 session_actions)
+            if status == "done":
+                log.info("[%s] Cycle complete: %s", bot_name, result.get("reason", ""))
+                return
+            if status == "error":
+                cycle_errors += 1
+                if cycle_errors >= 5:
+                    log.warning("[%s] 5+ errors, ending cycle", bot_name)
                     return
-                if result_data.get("error"):
-                    cycle_errors += 1
-                    if cycle_errors >= 5:
-                        log.warning("[%s] 5+ errors, ending cycle", bot_name)
-                        return
-                else:
-                    cycle_errors = 0
-            except (json.JSONDecodeError, TypeError):
-                pass
+            else:
+                cycle_errors = 0
 
-            messages.append({"role": "tool", "content": result})
+            messages.append({"role": "tool", "content": _encode_tool_result(status, result)})
 
     log.info("[%s] Smart cycle finished (max turns)", bot_name)
 
@@ -1727,12 +2422,115 @@ def run_smart_cycle(bot_name, client, personality):
 def _comfyui_available():
     """Quick health check on ComfyUI."""
     try:
-        r = requests.get(f"{COMFYUI_URL}/system_stats", timeout=5)
+        r = _http_session.get(f"{COMFYUI_URL}/system_stats", timeout=5)
         return r.status_code == 200
     except Exception:
         return False
 
 
+_DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+
+def _download_to_file(response, path):
+    """Copy a streamed response body to path in chunks; returns bytes written.
+
+    Removes the partial file if the transfer fails.
+    """
+    total = 0
+    try:
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(_DOWNLOAD_CHUNK_BYTES):
+                f.write(chunk)
+                total += len(chunk)
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    return total
+
+
+_COMFYUI_POLL_MAX_SEC = 15.0
+_COMFYUI_STOP_CHECK_SEC = 1.0  # how often a blocked WebSocket wait looks at the stop flag
+
+# Set when the daemon is shutting down; long waits on the video worker
+# (ComfyUI progress/polling) give up instead of holding up exit
+_stop_requested = threading.Event()
+
+
+def _comfyui_open_ws(client_id):
+    """Open ComfyUI's progress WebSocket for client_id, or None if unavailable."""
+    if websocket is None or not COMFYUI_USE_WS:
+        return None
+    ws_url = re.sub(r"^http", "ws", COMFYUI_URL, count=1) + f"/ws?clientId={client_id}"
+    try:
+        return websocket.create_connection(ws_url, timeout=10)
+    except Exception as e:
+        log.debug("ComfyUI WebSocket unavailable, polling instead: %s", e)
+        return None
+
+
+def _comfyui_wait_ws(ws, prompt_id, deadline):
+    """Block until ComfyUI reports prompt_id finished.
+
+    Returns False if the job failed or shutdown was requested; True when it
+    finished or the socket broke (the caller then falls back to polling
+    /history).
+    """
+    try:
+        while True:
+            if _stop_requested.is_set():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            ws.settimeout(min(remaining, _COMFYUI_STOP_CHECK_SEC))
+            try:
+                raw = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                continue
+            if not isinstance(raw, str):
+                continue  # binary preview frames
+            event = _json_loads(raw)
+            data = event.get("data") or {}
+            if data.get("prompt_id") != prompt_id:
+                continue
+            if event.get("type") == "executing" and data.get("node") is None:
+                return True
+            if event.get("type") == "execution_error":
+                log.error("ComfyUI job %s failed: %s", prompt_id,
+                          data.get("exception_message", "")[:200])
+                return False
+    except Exception as e:
+        log.debug("ComfyUI WebSocket dropped, polling instead: %s", e)
+        return True
+
+
+def _comfyui_fetch_output(prompt_id, bot_name):
+    """Check a job's history once. Returns (finished, downloaded path or None)."""
+    hr = _http_session.get(f"{COMFYUI_URL}/history/{prompt_id}", timeout=15)
+    if hr.status_code != 200:
+        return False, None
+    hist = hr.json()
+    if prompt_id not in hist:
+        return False, None
+    outputs = hist[prompt_id].get("outputs", {})
+    for node_id, out in outputs.items():
+        if "videos" in out:
+            vid = out["videos"][0]
+            fname = vid["filename"]
+            subfolder = vid.get("subfolder", "")
+            dl_url = f"{COMFYUI_URL}/view?filename={fname}&subfolder={subfolder}&type=output"
+            with _http_session.get(dl_url, timeout=60, stream=True) as dl:
+                if dl.status_code == 200:
+                    tmp = f"/tmp/bottube_{bot_name}_{int(time.time())}.mp4"
+                    total = _download_to_file(dl, tmp)
+                    log.info("Video downloaded: %s (%d bytes)", tmp, total)
+                    return True, tmp
+            # Output listed but not downloadable yet; try again next poll
+            return False, None
+    log.error("ComfyUI job %s finished without a video output", prompt_id)
+    return True, None
+
+
 def generate_video_comfyui(prompt_text, bot_name, timeout_sec=600):
     """Queue an LTX-2 video generation job on ComfyUI."""
     if not _comfyui_available():
@@ -1762,102 +2560,228 @@ def generate_video_comfyui(prompt_text, bot_name, timeout_sec=600):
         },
     }
 
+    client_id = uuid.uuid4().hex
+    ws = _comfyui_open_ws(client_id)
     try:
-        r = requests.post(f"{COMFYUI_URL}/prompt", json={"prompt": workflow}, timeout=30)
+        r = _http_session.post(f"{COMFYUI_URL}/prompt",
+                               json={"prompt": workflow, "client_id": client_id}, timeout=30)
         if r.status_code != 200:
             log.error("ComfyUI queue failed: %d %s", r.status_code, r.text[:200])
             return None
         prompt_id = r.json().get("prompt_id")
         log.info("ComfyUI job queued: %s for %s", prompt_id, bot_name)
 
-        max_polls = timeout_sec // 5
-        for _ in range(max_polls):
-            time.sleep(5)
-            hr = requests.get(f"{COMFYUI_URL}/history/{prompt_id}", timeout=15)
-            if hr.status_code == 200:
-                hist = hr.json()
-                if prompt_id in hist:
-                    outputs = hist[prompt_id].get("outputs", {})
-                    for node_id, out in outputs.items():
-                        if "videos" in out:
-                            vid = out["videos"][0]
-                            fname = vid["filename"]
-                            subfolder = vid.get("subfolder", "")
-                            dl_url = f"{COMFYUI_URL}/view?filename={fname}&subfolder={subfolder}&type=output"
-                            dl = requests.get(dl_url, timeout=60)
-                            if dl.status_code == 200:
-                                tmp = f"/tmp/bottube_{bot_name}_{int(time.time())}.mp4"
-                                with open(tmp, "wb") as f:
-                                    f.write(dl.content)
-                                log.info("Video downloaded: %s (%d bytes)", tmp, len(dl.content))
-                                return tmp
-        log.error("ComfyUI job %s timed out", prompt_id)
+        deadline = time.monotonic() + timeout_sec
+        if ws is not None and not _comfyui_wait_ws(ws, prompt_id, deadline):
+            return None
+        if _stop_requested.is_set():
+            return None
+
+        # Check history right away (the WS said it's done, or we're polling),
+        # then back off 1s, 2s, 4s ... up to _COMFYUI_POLL_MAX_SEC
+        delay = 1.0
+        while True:
+            finished, path = _comfyui_fetch_output(prompt_id, bot_name)
+            if finished:
+                return path
+            if time.monotonic() + delay > deadline or _stop_requested.wait(delay):
+                break
+            delay = min(delay * 2, _COMFYUI_POLL_MAX_SEC)
+        if _stop_requested.is_set():
+            log.info("ComfyUI job %s abandoned for shutdown", prompt_id)
+        else:
+            log.error("ComfyUI job %s timed out", prompt_id)
     except Exception as e:
         log.error("ComfyUI error: %s", e)
+    finally:
+        if ws is not None:
+            ws.close()
     return None
 
 
-def _sanitize_ffmpeg_text(text):
-    """Sanitize text for ffmpeg drawtext filter."""
-    text = re.sub(r'[\x00-\x1f\x7f]', '', text)
-    text = re.sub(r'[;\[\]%{}\\]', '', text)
-    text = text.replace("'", "\u2019")
-    text = text.replace(":", "\\:")
-    return text
+_HEX_COLOR_RE = re.compile(r"#[0-9a-fA-F]{6}")
+
+
+def _sanitize_ass_text(text):
+    """Sanitize text for an ASS subtitle event (no overrides or escapes)."""
+    return text.translate(_ASS_TEXT_TABLE)
 
 
 def _validate_hex_color(color):
     """Validate a hex color string."""
-    if re.match(r'^#[0-9a-fA-F]{6}$', color):
+    if _HEX_COLOR_RE.fullmatch(color):
         return color
     return "#1a1a2e"
 
 
+# Text cards are drawn by a single libass pass (the `ass` filter) over the
+# background, instead of chaining one drawtext filter per text element.
+_ASS_HEADER = (
+    "[Script Info]\n"
+    "ScriptType: v4.00+\n"
+    "PlayResX: 1280\n"
+    "PlayResY: 720\n"
+    "WrapStyle: 2\n"
+    "ScaledBorderAndShadow: yes\n"
+    "\n"
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+    "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+    "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    f"Style: Default,{FONT_NAME},48,&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+    "0,0,0,0,100,100,0,0,1,0,0,8,0,0,0,1\n"
+    "\n"
+    "[Events]\n"
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+)
+
+
+def _ass_color(hex_color):
+    """#rrggbb -> ASS &HBBGGRR& colour."""
+    return f"&H{hex_color[5:7]}{hex_color[3:5]}{hex_color[1:3]}&"
+
+
+def _ass_time(seconds):
+    """Seconds -> ASS H:MM:SS.cc timestamp."""
+    cs = int(round(seconds * 100))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+
+@functools.lru_cache(maxsize=64)
+def _ass_style_tags(align, size, color):
+    """Override tags for an alignment/size/colour, built once per combination."""
+    return f"\\an{align}\\fs{size}\\c{_ass_color(color)}"
+
+
+def _ass_event(start, end, text, x, y, size, color, align=8, extra=""):
+    """One Dialogue line: text anchored at (x, y) (align 8 = top-center, 7 = top-left)."""
+    return (
+        f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Default,,0,0,0,,"
+        f"{{{_ass_style_tags(align, size, color)}\\pos({x},{y}){extra}}}"
+        f"{_sanitize_ass_text(text)}\n"
+    )
+
+
+def _write_ass(path, events):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_ASS_HEADER)
+        f.writelines(events)
+
+
+def _ass_filter(ass_path):
+    """ffmpeg filter that renders an ASS file using the FONT_PATH directory."""
+    return f"ass=filename='{ass_path}':fontsdir='{os.path.dirname(FONT_PATH)}'"
+
+
+# H.264 encoders, best first. input_args go before the first -i; vf_suffix
+# is appended to the -vf chain (VAAPI needs frames uploaded to the GPU).
+FFMPEG_HWENC = os.environ.get("BOTTUBE_FFMPEG_HWENC", "auto")  # "off" = always libx264
+VAAPI_DEVICE = os.environ.get("BOTTUBE_VAAPI_DEVICE", "/dev/dri/renderD128")
+
+H264Encoder = namedtuple("H264Encoder", "name input_args output_args vf_suffix")
+
+_LIBX264 = H264Encoder(
+    "libx264", (), ("-c:v", "libx264", "-preset", "fast", "-crf", "23", "-pix_fmt", "yuv420p"), "")
+_HW_H264_ENCODERS = (
+    H264Encoder("h264_nvenc", (),
+                ("-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23",
+                 "-pix_fmt", "yuv420p"), ""),
+    H264Encoder("h264_videotoolbox", (),
+                ("-c:v", "h264_videotoolbox", "-b:v", "4M", "-pix_fmt", "yuv420p"), ""),
+    H264Encoder("h264_vaapi", ("-vaapi_device", VAAPI_DEVICE),
+                ("-c:v", "h264_vaapi", "-qp", "23"), ",format=nv12,hwupload"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _h264_encoder():
+    """Pick the H.264 encoder for generated videos, probing once per process.
+
+    A hardware encoder is used only if ffmpeg lists it *and* a one-frame
+    test encode succeeds (listed encoders often lack the device/driver).
+    """
+    if FFMPEG_HWENC == "off":
+        return _LIBX264
+    try:
+        listed = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return _LIBX264
+    for enc in _HW_H264_ENCODERS:
+        if enc.name not in listed:
+            continue
+        probe = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", *enc.input_args,
+            "-f", "lavfi", "-i", "color=c=black:s=256x144:d=0.1",
+            "-vf", "format=yuv420p" + enc.vf_suffix,
+            *enc.output_args, "-frames:v", "1", "-f", "null", "-",
+        ]
+        try:
+            if subprocess.run(probe, capture_output=True, timeout=20).returncode == 0:
+                log.info("Using hardware H.264 encoder: %s", enc.name)
+                return enc
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return _LIBX264
+
+
+def _lavfi_card_input(bg_color, duration):
+    """One lavfi input with a solid 1280x720 background and silent audio,
+    both exactly `duration` seconds long (so no -t / -shortest needed)."""
+    graph = (f"color=c={bg_color}:s=1280x720:d={duration}:r=24[out0];"
+             f"anullsrc=r=44100:cl=stereo:d={duration}[out1]")
+    return ("-f", "lavfi", "-i", graph)
+
+
+def _run_ffmpeg(cmd, log_prefix=""):
+    """Run an ffmpeg command; returns True on success, logging stderr otherwise."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    except subprocess.TimeoutExpired:
+        log.error("%sffmpeg timed out", log_prefix)
+        return False
+    if result.returncode != 0:
+        log.error("%sffmpeg error: %s", log_prefix, result.stderr[:500])
+        return False
+    return True
+
+
 def generate_text_video(text_lines, bg_color="#1a1a2e", text_color="#ffffff", duration_per_line=3):
     """Generate a text video with animated text using ffmpeg."""
     if not FONT_PATH:
         log.warning("No font available for ffmpeg text video")
         return None
-    vid_id = hashlib.md5(f"{time.time()}{random.random()}".encode()).hexdigest()[:12]
+    vid_id = secrets.token_hex(6)
     output_path = f"/tmp/bottube_text_{vid_id}.mp4"
+    ass_path = f"/tmp/bottube_text_{vid_id}.ass"
     text_lines = text_lines[:10]
     text_lines = [line[:200] for line in text_lines]
     bg_color = _validate_hex_color(bg_color)
     text_color = _validate_hex_color(text_color)
     total_duration = len(text_lines) * duration_per_line
 
-    drawtext_filters = []
-    for i, line in enumerate(text_lines):
-        start = i * duration_per_line
-        end = start + duration_per_line
-        escaped = _sanitize_ffmpeg_text(line)
-        drawtext_filters.append(
-            f"drawtext=text='{escaped}'"
-            f":fontfile={FONT_PATH}"
-            f":fontsize=48:fontcolor={text_color}"
-            f":x=(w-text_w)/2:y=(h-text_h)/2"
-            f":enable='between(t,{start},{end})'"
-            f":alpha='if(lt(t-{start},0.5),(t-{start})*2,if(gt(t,{end}-0.5),({end}-t)*2,1))'"
-        )
-    filter_str = ",".join(drawtext_filters)
+    # One centered line per time slot, 0.5s fade at each end
+    _write_ass(ass_path, [
+        _ass_event(i * duration_per_line, (i + 1) * duration_per_line, line,
+                   640, 360, 48, text_color, align=5, extra="\\fad(500,500)")
+        for i, line in enumerate(text_lines)
+    ])
 
+    enc = _h264_encoder()
     cmd = [
-        "ffmpeg", "-y",
-        "-f", "lavfi", "-i", f"color=c={bg_color}:s=1280x720:d={total_duration}:r=24",
-        "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-        "-t", str(total_duration),
-        "-vf", filter_str,
-        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-        "-c:a", "aac", "-shortest",
-        "-pix_fmt", "yuv420p",
+        "ffmpeg", "-y", *enc.input_args,
+        *_lavfi_card_input(bg_color, total_duration),
+        "-vf", _ass_filter(ass_path) + enc.vf_suffix,
+        *enc.output_args,
+        "-c:a", "aac",
         output_path,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-    if result.returncode != 0:
-        log.error("ffmpeg error: %s", result.stderr[:500])
-        return None
-    return output_path
+    try:
+        ok = _run_ffmpeg(cmd)
+    finally:
+        Path(ass_path).unlink(missing_ok=True)
+    return output_path if ok else None
 
 
 def upload_video(client, bot_name, video_path, title, description, tags_str):
@@ -1889,22 +2813,7 @@ HEYGEN_VOICE_ID = os.environ.get("HEYGEN_VOICE_ID", "054af44a167344d0af2722fdfef
 
 def _get_covered_headlines():
     """Get set of headline hashes already covered by the_daily_byte."""
-    covered = set()
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            rows = conn.execute(
-                "SELECT comment_text FROM bot_actions "
-                "WHERE bot_name='the_daily_byte' AND action_type='news_upload' "
-                "AND timestamp > ?",
-                (time.time() - 7 * 86400,),  # last 7 days
-            ).fetchall()
-            for row in rows:
-                if row[0]:
-                    covered.add(row[0])  # stored as headline hash
-        finally:
-            conn.close()
-    return covered
+    return _db_covered_hashes("the_daily_byte", "news_upload", 7 * 86400)  # last 7 days
 
 
 def _generate_anchor_script(headline, summary):
@@ -1918,7 +2827,8 @@ def _generate_anchor_script(headline, summary):
         "for optimal speech duration. Do NOT use markdown or special formatting."
     )
     user_prompt = f"Headline: {headline}\nSummary: {summary}"
-    script = _call_llm_text(system_prompt, user_prompt, max_tokens=300)
+    # Cached for a day: a retried or re-picked story reuses its script
+    script = _call_llm_text(system_prompt, user_prompt, max_tokens=300, cache_ttl=86400)
     if not script:
         # Fallback script
         hour = time.localtime().tm_hour
@@ -1931,32 +2841,51 @@ def _generate_anchor_script(headline, summary):
     return script[:600]  # HeyGen limit safety
 
 
-def _upload_news_video(api_key, video_path, title, description):
-    """Upload a news video to BoTTube with the 'news' category via raw API."""
+def _upload_category_video(auth_headers, video_path, title, description,
+                           tags, category, bot_name):
+    """POST a video with a category to /api/upload; returns the video_id or None.
+
+    With requests_toolbelt installed the multipart body is streamed from
+    disk with a known Content-Length instead of being built in memory.
+    """
     url = f"{BASE_URL}/api/upload"
-    headers = {"X-API-Key": api_key}
+    fields = {
+        "title": title[:200],
+        "description": description[:2000],
+        "tags": tags,
+        "category": category,
+    }
     try:
         with open(video_path, "rb") as f:
-            files = {"video": (os.path.basename(video_path), f, "video/mp4")}
-            data = {
-                "title": title[:200],
-                "description": description[:2000],
-                "tags": "news,breaking,daily-byte,ai-anchor,current-events",
-                "category": "news",
-            }
-            r = requests.post(url, headers=headers, files=files, data=data,
-                              timeout=120, verify=False)
+            video = (os.path.basename(video_path), f, "video/mp4")
+            if MultipartEncoder is not None:
+                body = MultipartEncoder(fields={**fields, "video": video})
+                headers = {**auth_headers, "Content-Type": body.content_type}
+                r = _http_session.post(url, headers=headers, data=body,
+                                       timeout=120, verify=False)
+            else:
+                r = _http_session.post(url, headers=auth_headers, files={"video": video},
+                                       data=fields, timeout=120, verify=False)
         if r.status_code in (200, 201):
             result = r.json()
-            log.info("[the_daily_byte] Uploaded news video: %s", result.get("watch_url", "?"))
+            log.info("[%s] Uploaded %s video: %s", bot_name, category,
+                     result.get("watch_url", "?"))
             return result.get("video_id")
         else:
-            log.error("[the_daily_byte] Upload failed (%d): %s", r.status_code, r.text[:300])
+            log.error("[%s] Upload failed (%d): %s", bot_name, r.status_code, r.text[:300])
     except Exception as e:
-        log.error("[the_daily_byte] Upload error: %s", e)
+        log.error("[%s] Upload error: %s", bot_name, e)
     return None
 
 
+def _upload_news_video(auth_headers, video_path, title, description):
+    """Upload a news video to BoTTube with the 'news' category via raw API."""
+    return _upload_category_video(
+        auth_headers, video_path, title, description,
+        "news,breaking,daily-byte,ai-anchor,current-events", "news", "the_daily_byte",
+    )
+
+
 def generate_news_video(bot_brain):
     """Full news cycle: fetch headline -> LLM script -> HeyGen video -> upload.
 
@@ -2030,7 +2959,7 @@ def generate_news_video(bot_brain):
     if not used_heygen:
         description += " (Text report — avatar video unavailable)"
 
-    vid_id = _upload_news_video(bot_brain.api_key, video_path, title, description)
+    vid_id = _upload_news_video(AUTH_HEADERS[bot_brain.name], video_path, title, description)
 
     # 5. Cleanup temp file
     try:
@@ -2068,22 +2997,7 @@ def generate_news_video(bot_brain):
 
 def _get_covered_cities():
     """Get set of city hashes already covered by skywatch_ai (2-day window)."""
-    covered = set()
-    with _db_lock:
-        conn = _db_conn()
-        try:
-            rows = conn.execute(
-                "SELECT comment_text FROM bot_actions "
-                "WHERE bot_name='skywatch_ai' AND action_type='weather_upload' "
-                "AND timestamp > ?",
-                (time.time() - 2 * 86400,),  # 2-day dedup window
-            ).fetchall()
-            for row in rows:
-                if row[0]:
-                    covered.add(row[0])  # stored as city hash
-        finally:
-            conn.close()
-    return covered
+    return _db_covered_hashes("skywatch_ai", "weather_upload", 2 * 86400)  # 2-day dedup window
 
 
 def _generate_weather_script(weather):
@@ -2102,7 +3016,8 @@ def _generate_weather_script(weather):
         f"Humidity: {weather['humidity']}%\n"
         f"High: {weather['daily_high_f']}°F / Low: {weather['daily_low_f']}°F"
     )
-    script = _call_llm_text(system_prompt, user_prompt, max_tokens=200)
+    # The prompt embeds the readings, so only an identical report hits the cache
+    script = _call_llm_text(system_prompt, user_prompt, max_tokens=200, cache_ttl=86400)
     if not script:
         # Fallback
         script = (
@@ -2114,6 +3029,9 @@ def _generate_weather_script(weather):
     return script[:400]
 
 
+_WEATHER_STAT_XS = (80, 380, 640, 920)  # Feels | Wind | Humidity | High/Low
+
+
 def generate_weather_graphic(weather, summary):
     """Generate a dark-blue weather card video using ffmpeg (1280x720, 15s).
 
@@ -2127,8 +3045,9 @@ def generate_weather_graphic(weather, summary):
         log.warning("No font available for weather graphic")
         return None
 
-    vid_id = hashlib.md5(f"weather_{time.time()}_{random.random()}".encode()).hexdigest()[:12]
+    vid_id = secrets.token_hex(6)
     output_path = f"/tmp/bottube_weather_{vid_id}.mp4"
+    ass_path = f"/tmp/bottube_weather_{vid_id}.ass"
     duration = 15
 
     city_label = f"{weather['city']}, {weather['state']}"
@@ -2140,105 +3059,48 @@ def generate_weather_graphic(weather, summary):
     humidity = f"Humidity {weather['humidity']}pct"
     hilo = f"H {weather['daily_high_f']}F / L {weather['daily_low_f']}F"
 
-    # Sanitize all text for ffmpeg
-    city_label = _sanitize_ffmpeg_text(city_label)
-    temp_str = _sanitize_ffmpeg_text(temp_str)
-    condition = _sanitize_ffmpeg_text(condition)
-    timestamp = _sanitize_ffmpeg_text(timestamp)
-    feels = _sanitize_ffmpeg_text(feels)
-    wind = _sanitize_ffmpeg_text(wind)
-    humidity = _sanitize_ffmpeg_text(humidity)
-    hilo = _sanitize_ffmpeg_text(hilo)
-    summary_text = _sanitize_ffmpeg_text(summary[:200])
-
-    filters = [
-        # Header: SKYWATCH AI
-        f"drawtext=text='SKYWATCH AI'"
-        f":fontfile={FONT_PATH}:fontsize=36:fontcolor=#90caf9"
-        f":x=(w-text_w)/2:y=40",
-        # Timestamp
-        f"drawtext=text='{timestamp}'"
-        f":fontfile={FONT_PATH}:fontsize=20:fontcolor=#b0bec5"
-        f":x=(w-text_w)/2:y=85",
-        # City name
-        f"drawtext=text='{city_label}'"
-        f":fontfile={FONT_PATH}:fontsize=52:fontcolor=#ffffff"
-        f":x=(w-text_w)/2:y=160",
-        # Big temperature
-        f"drawtext=text='{temp_str}'"
-        f":fontfile={FONT_PATH}:fontsize=120:fontcolor=#ffcc02"
-        f":x=(w-text_w)/2:y=230",
-        # Condition
-        f"drawtext=text='{condition}'"
-        f":fontfile={FONT_PATH}:fontsize=32:fontcolor=#e0e0e0"
-        f":x=(w-text_w)/2:y=370",
-        # Stats row
-        f"drawtext=text='{feels}'"
-        f":fontfile={FONT_PATH}:fontsize=22:fontcolor=#80cbc4"
-        f":x=80:y=440",
-        f"drawtext=text='{wind}'"
-        f":fontfile={FONT_PATH}:fontsize=22:fontcolor=#80cbc4"
-        f":x=380:y=440",
-        f"drawtext=text='{humidity}'"
-        f":fontfile={FONT_PATH}:fontsize=22:fontcolor=#80cbc4"
-        f":x=640:y=440",
-        f"drawtext=text='{hilo}'"
-        f":fontfile={FONT_PATH}:fontsize=22:fontcolor=#80cbc4"
-        f":x=920:y=440",
-        # Summary text (bottom)
-        f"drawtext=text='{summary_text}'"
-        f":fontfile={FONT_PATH}:fontsize=20:fontcolor=#cfd8dc"
-        f":x=(w-text_w)/2:y=520",
-        # Fade in/out
-        f"fade=t=in:st=0:d=1,fade=t=out:st={duration - 1}:d=1",
-    ]
-    filter_str = ",".join(filters)
-
+    # Header, city/temperature/condition, stats row, then the summary
+    end = duration
+    _write_ass(ass_path, [
+        _ass_event(0, end, "SKYWATCH AI", 640, 40, 36, "#90caf9"),
+        _ass_event(0, end, timestamp, 640, 85, 20, "#b0bec5"),
+        _ass_event(0, end, city_label, 640, 160, 52, "#ffffff"),
+        _ass_event(0, end, temp_str, 640, 230, 120, "#ffcc02"),
+        _ass_event(0, end, condition, 640, 370, 32, "#e0e0e0"),
+        *(_ass_event(0, end, stat, x, 440, 22, "#80cbc4", align=7)
+          for x, stat in zip(_WEATHER_STAT_XS, (feels, wind, humidity, hilo))),
+        _ass_event(0, end, summary[:200], 640, 520, 20, "#cfd8dc"),
+    ])
+    filter_str = (f"{_ass_filter(ass_path)},"
+                  f"fade=t=in:st=0:d=1,fade=t=out:st={duration - 1}:d=1")
+
+    enc = _h264_encoder()
     cmd = [
-        "ffmpeg", "-y",
-        "-f", "lavfi", "-i", f"color=c=#0d1b2a:s=1280x720:d={duration}:r=24",
-        "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
-        "-t", str(duration),
-        "-vf", filter_str,
-        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-        "-c:a", "aac", "-shortest",
-        "-pix_fmt", "yuv420p",
+        "ffmpeg", "-y", *enc.input_args,
+        *_lavfi_card_input("#0d1b2a", duration),
+        "-vf", filter_str + enc.vf_suffix,
+        *enc.output_args,
+        "-c:a", "aac",
         output_path,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-    if result.returncode != 0:
-        log.error("[skywatch_ai] ffmpeg error: %s", result.stderr[:500])
+    try:
+        ok = _run_ffmpeg(cmd, "[skywatch_ai] ")
+    finally:
+        Path(ass_path).unlink(missing_ok=True)
+    if not ok:
         return None
 
     log.info("[skywatch_ai] Weather graphic generated: %s", output_path)
     return output_path
 
 
-def _upload_weather_video(api_key, video_path, title, description):
+def _upload_weather_video(auth_headers, video_path, title, description):
     """Upload a weather video to BoTTube with the 'weather' category via raw API."""
-    url = f"{BASE_URL}/api/upload"
-    headers = {"X-API-Key": api_key}
-    try:
-        with open(video_path, "rb") as f:
-            files = {"video": (os.path.basename(video_path), f, "video/mp4")}
-            data = {
-                "title": title[:200],
-                "description": description[:2000],
-                "tags": "weather,forecast,skywatch,ai-meteorologist,conditions",
-                "category": "weather",
-            }
-            r = requests.post(url, headers=headers, files=files, data=data,
-                              timeout=120, verify=False)
-        if r.status_code in (200, 201):
-            result = r.json()
-            log.info("[skywatch_ai] Uploaded weather video: %s", result.get("watch_url", "?"))
-            return result.get("video_id")
-        else:
-            log.error("[skywatch_ai] Upload failed (%d): %s", r.status_code, r.text[:300])
-    except Exception as e:
-        log.error("[skywatch_ai] Upload error: %s", e)
-    return None
+    return _upload_category_video(
+        auth_headers, video_path, title, description,
+        "weather,forecast,skywatch,ai-meteorologist,conditions", "weather", "skywatch_ai",
+    )
 
 
 def generate_weather_video(bot_brain):
@@ -2295,7 +3157,7 @@ def generate_weather_video(bot_brain):
         f"\n\n{summary}"
     )
 
-    vid_id = _upload_weather_video(bot_brain.api_key, video_path, title, description)
+    vid_id = _upload_weather_video(AUTH_HEADERS[bot_brain.name], video_path, title, description)
 
     # 6. Cleanup temp file
     try:
@@ -2333,26 +3195,135 @@ def generate_weather_video(bot_brain):
 # ---------------------------------------------------------------------------
 
 JANITOR_ADMIN_KEY = os.environ.get("BOTTUBE_ADMIN_KEY", "")
+JANITOR_ADMIN_WORKERS = 4  # concurrent nuke/ban calls per sweep (bounded for the admin API)
 
 # Blocklist mirrors the server-side list — kept in sync for local pre-checks
+# Plain terms as (term, whole_word); whole_word=False is a stem that only
+# needs a word boundary in front ("weaponiz" also catches "weaponized").
+# With pyahocorasick these are all found in one automaton pass over
+# lowercased ASCII text; anything non-ASCII goes through the full regex.
+_JANITOR_TERMS = (
+    ("csam", True), ("pedophil", False), ("jailbait", True), ("loli", True),
+    ("shota", True), ("isis", True), ("weaponiz", False), ("snuff", True),
+)
+# Terms with optional parts or gaps stay regexes
 _JANITOR_BLOCKLIST = [
-    r"\bcsam\b", r"\bchild\s*(porn|sex|exploit|abuse)", r"\bpedophil",
-    r"\bjailbait\b", r"\bloli\b", r"\bshota\b", r"\bunderage\s*(sex|nude|porn)",
-    r"\bminor\s*(sex|nude|porn)", r"\bisis\b", r"\bal[- ]?qaeda\b",
+    r"\bchild\s*(porn|sex|exploit|abuse)", r"\bunderage\s*(sex|nude|porn)",
+    r"\bminor\s*(sex|nude|porn)", r"\bal[- ]?qaeda\b",
     r"\bjihad\s*(training|manual|recruit)", r"\bbehead(ing)?\b",
     r"\bterror(ist)?\s*(manual|recruit|attack\s*plan)", r"\bbomb\s*making\b",
     r"\bsynthe(size|sis)\s*(meth|fentanyl|sarin|ricin|vx)\b",
-    r"\bnapalm\s*recipe\b", r"\bweaponiz", r"\bdoxx(ing|ed)?\b",
+    r"\bnapalm\s*recipe\b", r"\bdoxx(ing|ed)?\b",
     r"\bswatt(ing|ed)?\b", r"\bpersonal\s*info.*leak", r"\breal\s*gore\b",
-    r"\bcrush\s*fetish\b", r"\banimal\s*torture\b", r"\bsnuff\b",
+    r"\bcrush\s*fetish\b", r"\banimal\s*torture\b",
     r"\brape\s*(porn|video|fantasy)", r"\brevenge\s*porn\b",
 ]
-_JANITOR_PATTERN = re.compile("|".join(_JANITOR_BLOCKLIST), re.IGNORECASE)
+
+_janitor_term_regexes = [
+    rf"\b{re.escape(t)}\b" if whole else rf"\b{re.escape(t)}" for t, whole in _JANITOR_TERMS
+]
+
+if ahocorasick is not None:
+    _JANITOR_AUTOMATON = ahocorasick.Automaton()
+    for _term, _whole_word in _JANITOR_TERMS:
+        _JANITOR_AUTOMATON.add_word(_term, (_term, _whole_word))
+    _JANITOR_AUTOMATON.make_automaton()
+else:
+    _JANITOR_AUTOMATON = None
+
+
+def _janitor_trie_pattern(patterns):
+    """Compile \\b-prefixed patterns as one regex with shared prefixes factored.
+
+    re tries alternation branches one by one at each position, so the
+    literal head of every pattern goes into a character trie and the
+    regex is emitted from it: "\\bchild...|\\bcrush...|\\bcsam" becomes
+    \\bc(?:hild...|rush...|sam). A word start then walks one branch per
+    character instead of retrying every entry.
+    """
+    trie = {}
+    for pat in patterns:
+        body = pat[2:]  # drop the leading \b
+        node = trie
+        i = 0
+        # Literal head: plain characters not followed by a quantifier
+        while (i < len(body) and body[i] not in "\\.^$*+?{}[]()|"
+               and (i + 1 == len(body) or body[i + 1] not in "*+?{")):
+            node = node.setdefault(body[i], {})
+            i += 1
+        node.setdefault("", []).append(body[i:])
+
+    def emit(node):
+        branches = [ch + emit(child) for ch, child in node.items() if ch]
+        branches += sorted(node.get("", ()), key=lambda tail: tail == "")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return re.compile(r"\b" + emit(trie), re.IGNORECASE)
+
+
+# The full blocklist is the authoritative scanner; with the automaton in
+# use, ASCII text only needs the entries it does not cover.
+_JANITOR_PATTERN = _janitor_trie_pattern(_janitor_term_regexes + _JANITOR_BLOCKLIST)
+_JANITOR_REST_PATTERN = _janitor_trie_pattern(_JANITOR_BLOCKLIST)
+
+# Every blocklist entry needs one of these stems, so text containing none of
+# them is clean without running the scanners. The gate is a single flat
+# IGNORECASE alternation: it must use re's case matching, not str.casefold()
+# (which e.g. leaves a dotless "ı" alone where re matches it to "i").
+_JANITOR_STEMS = (
+    "csam", "child", "pedophil", "jailbait", "loli", "shota", "underage", "minor",
+    "isis", "qaeda", "jihad", "behead", "terror", "bomb", "synthe", "napalm",
+    "weaponiz", "doxx", "swatt", "leak", "gore", "crush", "tortur", "snuff",
+    "rape", "revenge",
+)
+_JANITOR_STEM_RE = re.compile("|".join(_JANITOR_STEMS), re.IGNORECASE)
+# Nothing shorter than the shortest stem can match (titles, usernames)
+_JANITOR_MIN_LEN = min(map(len, _JANITOR_STEMS))
+
+
+def _is_word_char(ch):
+    """Same test as re's \\b for str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+def _janitor_find_term(folded):
+    """First _JANITOR_TERMS hit in lowercased ASCII text that sits on word boundaries."""
+    for end, (term, whole_word) in _JANITOR_AUTOMATON.iter(folded):
+        start = end - len(term) + 1
+        if start and _is_word_char(folded[start - 1]):
+            continue
+        if whole_word and end + 1 < len(folded) and _is_word_char(folded[end + 1]):
+            continue
+        return term
+    return None
 
 
 def _janitor_scan_content(text):
     """Quick local scan — returns (is_ok, matched_term_or_None)."""
-    m = _JANITOR_PATTERN.search(text or "")
+    if not text or len(text) < _JANITOR_MIN_LEN:
+        return True, None
+    return _janitor_scan_text(text)
+
+
+# Templated comments and canned summaries recur, so scans are memoized on
+# the text itself (str caches its own hash; no collision handling needed)
+@functools.lru_cache(maxsize=4096)
+def _janitor_scan_text(text):
+    if not _JANITOR_STEM_RE.search(text):
+        return True, None
+    if _JANITOR_AUTOMATON is not None and text.isascii():
+        # For ASCII, lower() keeps every index and is exactly re's
+        # IGNORECASE mapping, so automaton hits agree with the regex.
+        # Non-ASCII text (dotless i, long s, ligatures...) can differ under
+        # lower()/casefold(), so it always gets the full regex verdict.
+        term = _janitor_find_term(text.lower())
+        if term:
+            return False, term
+        m = _JANITOR_REST_PATTERN.search(text)
+    else:
+        m = _JANITOR_PATTERN.search(text)
     if m:
         return False, m.group()
     return True, None
@@ -2367,11 +3338,11 @@ def _janitor_admin_call(endpoint, payload=None, method="POST"):
     headers = {"X-Admin-Key": JANITOR_ADMIN_KEY, "Content-Type": "application/json"}
     try:
         if method == "POST":
-            r = requests.post(url, json=payload or {}, headers=headers,
-                              timeout=30, verify=False)
+            r = _http_session.post(url, json=payload or {}, headers=headers,
+                                   timeout=30, verify=False)
         else:
-            r = requests.get(url, params=payload or {}, headers=headers,
-                             timeout=30, verify=False)
+            r = _http_session.get(url, params=payload or {}, headers=headers,
+                                  timeout=30, verify=False)
         if r.status_code in (200, 201):
             return r.json()
         log.warning("[janitor] Admin call %s returned %d: %s", endpoint, r.status_code, r.text[:200])
@@ -2380,6 +3351,13 @@ def _janitor_admin_call(endpoint, payload=None, method="POST"):
     return None
 
 
+def _janitor_fetch_feed():
+    """Latest 50 feed videos for spam detection."""
+    r = _http_session.get(f"{BASE_URL}/api/feed", params={"limit": 50}, timeout=15, verify=False)
+    r.raise_for_status()
+    return r.json().get("videos", [])
+
+
 def run_janitor_sweep():
     """Full moderation sweep: scan content, nuke flagged agents, detect spam.
 
@@ -2387,59 +3365,73 @@ def run_janitor_sweep():
     """
     actions_taken = 0
 
-    # 1. Trigger server-side content scan
-    log.info("[janitor] Running content moderation sweep")
-    result = _janitor_admin_call("scan-content", method="GET")
-    if result:
-        flagged_count = result.get("flagged", 0)
-        if flagged_count:
-            log.warning("[janitor] Server scan flagged %d items", flagged_count)
-            for item in result.get("results", []):
-                agent_name = item.get("agent", "?")
-                reason = f"content_violation: {item.get('matched_term', '?')}"
-                log.warning("[janitor] Flagged agent '%s': %s", agent_name, reason)
-                # Auto-ban the agent (nuke removes all their content)
-                nuke_result = _janitor_admin_call("nuke", {
-                    "agent_name": agent_name,
-                    "reason": f"auto-janitor: {reason}",
-                })
-                if nuke_result and nuke_result.get("ok"):
-                    log.warning("[janitor] NUKED agent '%s' (%d videos removed)",
-                                agent_name, nuke_result.get("videos_deleted", 0))
-                    actions_taken += 1
-        else:
-            log.info("[janitor] Content scan clean — no violations found")
+    # Fetch the feed for step 2 while the server-side scan runs; the same
+    # pool then fans out the nuke/ban admin calls
+    pool = ThreadPoolExecutor(max_workers=JANITOR_ADMIN_WORKERS, thread_name_prefix="janitor")
+    feed_future = pool.submit(_janitor_fetch_feed)
 
-    # 2. Detect spam patterns: agents uploading too fast that aren't our bots
     try:
-        r = requests.get(f"{BASE_URL}/api/feed", params={"limit": 50}, timeout=15, verify=False)
-        if r.status_code == 200:
-            videos = r.json().get("videos", [])
-            # Count videos per agent in last hour
-            from collections import Counter
-            now = time.time()
-            hour_counts = Counter()
-            for v in videos:
-                agent_name = v.get("agent_name", "")
-                # Skip our own bots
-                if agent_name in BOT_PROFILES:
-                    continue
-                uploaded = v.get("uploaded_at", "")
-                # Simple recency check: if it's in the latest 50, it's recent enough
-                hour_counts[agent_name] += 1
-
-            for agent_name, count in hour_counts.items():
-                if count >= 10:  # 10+ videos from a non-bot agent in recent feed = spam
-                    log.warning("[janitor] Spam pattern: '%s' has %d videos in recent feed", agent_name, count)
-                    ban_result = _janitor_admin_call("ban", {
+        # 1. Trigger server-side content scan
+        log.info("[janitor] Running content moderation sweep")
+        result = _janitor_admin_call("scan-content", method="GET")
+        if result:
+            flagged_count = result.get("flagged", 0)
+            if flagged_count:
+                log.warning("[janitor] Server scan flagged %d items", flagged_count)
+                nukes = {}
+                nuked = set()
+                for item in result.get("results", []):
+                    agent_name = item.get("agent", "?")
+                    reason = f"content_violation: {item.get('matched_term', '?')}"
+                    log.warning("[janitor] Flagged agent '%s': %s", agent_name, reason)
+                    if agent_name in nuked:
+                        continue  # one nuke per agent, even with several flagged items
+                    nuked.add(agent_name)
+                    # Auto-ban the agent (nuke removes all their content)
+                    nukes[pool.submit(_janitor_admin_call, "nuke", {
                         "agent_name": agent_name,
-                        "reason": f"auto-janitor: spam pattern ({count} uploads in burst)",
-                    })
+                        "reason": f"auto-janitor: {reason}",
+                    })] = agent_name
+                for fut in as_completed(nukes):
+                    nuke_result = fut.result()
+                    if nuke_result and nuke_result.get("ok"):
+                        log.warning("[janitor] NUKED agent '%s' (%d videos removed)",
+                                    nukes[fut], nuke_result.get("videos_deleted", 0))
+                        actions_taken += 1
+            else:
+                log.info("[janitor] Content scan clean — no violations found")
+
+        # 2. Detect spam patterns: agents uploading too fast that aren't our bots
+        try:
+            videos = feed_future.result()
+            if videos:
+                # Count videos per agent in last hour
+                hour_counts = {}
+                for v in videos:
+                    agent_name = v.get("agent_name", "")
+                    # Skip our own bots (and entries with no agent at all)
+                    if not agent_name or agent_name in _BOT_NAME_SET:
+                        continue
+                    # Simple recency check: if it's in the latest 50, it's recent enough
+                    hour_counts[agent_name] = hour_counts.get(agent_name, 0) + 1
+
+                bans = {}
+                for agent_name, count in hour_counts.items():
+                    if count >= 10:  # 10+ videos from a non-bot agent in recent feed = spam
+                        log.warning("[janitor] Spam pattern: '%s' has %d videos in recent feed", agent_name, count)
+                        bans[pool.submit(_janitor_admin_call, "ban", {
+                            "agent_name": agent_name,
+                            "reason": f"auto-janitor: spam pattern ({count} uploads in burst)",
+                        })] = agent_name
+                for fut in as_completed(bans):
+                    ban_result = fut.result()
                     if ban_result and ban_result.get("ok"):
-                        log.warning("[janitor] BANNED spam agent '%s'", agent_name)
+                        log.warning("[janitor] BANNED spam agent '%s'", bans[fut])
                         actions_taken += 1
-    except Exception as e:
-        log.debug("[janitor] Spam detection check failed: %s", e)
+        except Exception as e:
+            log.debug("[janitor] Spam detection check failed: %s", e)
+    finally:
+        pool.shutdown(wait=False)
 
     log.info("[janitor] Sweep complete — %d actions taken", actions_taken)
     return actions_taken
@@ -2449,16 +3441,16 @@ def run_janitor_sweep():
 # BotBrain — Per-bot decision engine
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class BotBrain:
     name: str
     api_key: str
     display: str
-    activity: str
+    activity: Activity
     tier: str
     interval_min: int
     interval_max: int
-    video_prompts: list
+    video_prompts: tuple
     client: object = None  # BoTTubeClient
 
     # State tracking
@@ -2467,41 +3459,35 @@ class BotBrain:
     last_video_ts: float = 0.0
     next_wake_ts: float = 0.0
     videos_uploaded: int = 0
+    _dirty: bool = field(default=False, init=False, repr=False)  # see _flush_dirty_bots
 
     def __post_init__(self):
-        if BoTTubeClient and self.api_key:
-            self.client = BoTTubeClient(base_url=BASE_URL, api_key=self.api_key)
+        client_cls = _get_bottube_client_cls()
+        if client_cls and self.api_key:
+            self.client = client_cls(base_url=BASE_URL, api_key=self.api_key)
         # Load persisted state
         state = _db_load_bot_state(self.name)
         if state:
-            self.last_action_ts = state["last_action_ts"]
-            self.last_comment_ts = state["last_comment_ts"]
-            self.last_video_ts = state["last_video_ts"]
-            self.next_wake_ts = state["next_wake_ts"]
-            self.videos_uploaded = state["videos_uploaded"]
+            self.last_action_ts = state.last_action_ts
+            self.last_comment_ts = state.last_comment_ts
+            self.last_video_ts = state.last_video_ts
+            self.next_wake_ts = state.next_wake_ts
+            self.videos_uploaded = state.videos_uploaded
             log.debug("Loaded state for %s (wake in %.0fs)", self.name,
                       max(0, self.next_wake_ts - time.time()))
 
     def save_state(self):
-        """Persist current state to DB."""
-        _db_save_bot_state(
-            self.name,
-            last_action_ts=self.last_action_ts,
-            last_comment_ts=self.last_comment_ts,
-            last_video_ts=self.last_video_ts,
-            next_wake_ts=self.next_wake_ts,
-            videos_uploaded=self.videos_uploaded,
-        )
+        """Mark state for persisting; the main loop writes dirty bots once per cycle."""
+        self._dirty = True
 
     def can_comment(self):
-        return _db_comments_this_hour(self.name) < MAX_COMMENTS_PER_BOT_PER_HOUR
+        return _comments_this_hour(self.name) < MAX_COMMENTS_PER_BOT_PER_HOUR
 
     def already_commented_on(self, video_id):
-        return _db_already_commented(self.name, video_id)
+        return _already_commented(self.name, video_id)
 
     def record_comment(self, video_id, comment_text=""):
-        self.last_comment_ts = time.time()
-        self.last_action_ts = time.time()
+        self.last_comment_ts = self.last_action_ts = time.time()
         _db_record_action(self.name, "comment", video_id, comment_text=comment_text)
         self.save_state()
 
@@ -2509,25 +3495,47 @@ class BotBrain:
         self.last_action_ts = time.time()
         self.save_state()
 
-    def schedule_next_wake(self):
-        """Set next wake time using exponential distribution."""
-        scale = {"high": 1.0, "medium": 1.5, "low": 2.0}.get(self.activity, 1.5)
-        mean_interval = (self.interval_min + self.interval_max) / 2 * scale
-        interval = random.expovariate(1.0 / mean_interval)
-        interval = max(self.interval_min * 0.5, min(interval, self.interval_max * 1.5))
-
-        hour = time.gmtime().tm_hour
-        if 2 <= hour <= 8:
-            interval *= 1.3
-        elif 14 <= hour <= 22:
-            interval *= 0.7
-
-        self.next_wake_ts = time.time() + interval
-        self.save_state()
-        return interval
-
-    def is_awake(self):
-        return time.time() >= self.next_wake_ts
+    def is_awake(self, now=None):
+        return (time.time() if now is None else now) >= self.next_wake_ts
+
+
+def _draw_wake_intervals(names):
+    """Draw the next Poisson wake interval for each named bot in one pass."""
+    hour = time.gmtime().tm_hour
+    if 2 <= hour <= 8:
+        factor = 1.3
+    elif 14 <= hour <= 22:
+        factor = 0.7
+    else:
+        factor = 1.0
+    expovariate = random.expovariate
+    uniform = random.uniform
+    intervals = []
+    for name in names:
+        i = BOT_INDEX[name]
+        interval = expovariate(1.0 / BOT_WAKE_MEAN[i])
+        interval = max(BOT_WAKE_FLOOR[i], min(interval, BOT_WAKE_CEIL[i])) * factor
+        # ±5% jitter keeps clamped draws from landing on identical wake times
+        intervals.append(interval * uniform(0.95, 1.05))
+    return intervals
+
+
+def _flush_dirty_bots(brains):
+    """Persist every bot marked by save_state() in a single transaction."""
+    dirty = [b for b in brains if b._dirty]
+    if dirty:
+        for b in dirty:
+            b._dirty = False
+        _db_save_bot_states(dirty)
+
+
+def schedule_wakes(brains):
+    """Set next wake times for a batch of bots and persist them in one write."""
+    now = time.time()
+    for brain, interval in zip(brains, _draw_wake_intervals([b.name for b in brains])):
+        brain.next_wake_ts = now + interval
+        log.debug("%s next wake in %.0f min", brain.name, interval / 60)
+    _db_save_bot_states(brains)
 
 
 # ---------------------------------------------------------------------------
@@ -2535,8 +3543,10 @@ class BotBrain:
 # ---------------------------------------------------------------------------
 
 class ActivityScheduler:
+    __slots__ = ("action_timestamps", "last_action_ts", "videos_today", "day_start")
+
     def __init__(self):
-        self.action_timestamps = []
+        self.action_timestamps = deque()  # appended in time order
         self.last_action_ts = 0.0
         self.videos_today = 0
         self.day_start = time.time()
@@ -2551,13 +3561,16 @@ class ActivityScheduler:
             return False
 
         cutoff = now - 3600
-        self.action_timestamps = [t for t in self.action_timestamps if t > cutoff]
-        if len(self.action_timestamps) >= MAX_ACTIONS_PER_HOUR:
+        timestamps = self.action_timestamps
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+        if len(timestamps) >= MAX_ACTIONS_PER_HOUR:
             return False
 
-        recent = [t for t in self.action_timestamps if t > now - 1800]
-        if len(recent) >= BURST_THRESHOLD:
-            log.info("Burst detected (%d actions in 30 min)", len(recent))
+        # Sorted, so the last 30 minutes start at the bisection point
+        recent = len(timestamps) - bisect.bisect_right(timestamps, now - 1800)
+        if recent >= BURST_THRESHOLD:
+            log.info("Burst detected (%d actions in 30 min)", recent)
             return False
 
         return True
@@ -2578,38 +3591,145 @@ class ActivityScheduler:
 # Health Monitoring Endpoint
 # ---------------------------------------------------------------------------
 
-class HealthHandler(BaseHTTPRequestHandler):
-    agent_ref = None
-
-    def do_GET(self):
-        if self.path == "/health":
-            agent = self.agent_ref
-            status = {
-                "ok": True,
-                "bots": len(agent.bots) if agent else 0,
-                "uptime_s": round(time.time() - agent._start_ts, 1) if agent else 0,
-                "actions_last_hour": len(agent.scheduler.action_timestamps) if agent else 0,
-                "videos_today": agent.scheduler.videos_today if agent else 0,
-            }
-            if agent:
-                status["bot_status"] = {
-                    name: {
-                        "tier": brain.tier,
-                        "next_wake_in": max(0, round(brain.next_wake_ts - time.time())),
-                        "comments_1h": _db_comments_this_hour(name),
-                    }
-                    for name, brain in agent.bots.items()
-                }
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(status, indent=2).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
+_HEALTH_MAX_REQUEST_BYTES = 8192
+_HEALTH_CLIENT_TIMEOUT_SEC = 10.0
+_HEALTH_CACHE_SEC = 2.0  # probes within this window get the same response bytes
+_HEALTH_NOT_FOUND = (
+    b"HTTP/1.1 404 Not Found\r\n"
+    b"Content-Length: 0\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+# Pretty-printed status body as bytes (orjson's indent matches indent=2)
+if orjson is not None:
+    def _health_body(status):
+        return orjson.dumps(status, option=orjson.OPT_INDENT_2)
+else:
+    def _health_body(status):
+        return json.dumps(status, indent=2).encode()
 
-    def log_message(self, format, *args):
-        pass  # Suppress access logs
+
+class HealthServer:
+    """Minimal /health endpoint on a single-threaded selectors loop.
+
+    Probes are answered inline — no handler object or thread per request —
+    and every connection is closed after its response.
+    """
+
+    def __init__(self, agent, host="0.0.0.0", port=HEALTH_PORT):
+        self.agent = agent
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(16)
+        self.sock.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
+        self._clients = {}  # socket -> [request bytes, deadline]
+        self._cached_response = b""
+        self._cached_until = 0.0
+
+    def serve_forever(self):
+        while True:
+            for key, _ in self.selector.select(timeout=1.0):
+                if key.fileobj is self.sock:
+                    try:
+                        self._accept()
+                    except Exception as e:
+                        log.warning("Health server accept failed: %s", e)
+                    continue
+                try:
+                    self._read(key.fileobj)
+                except Exception:
+                    # One bad probe must not take the endpoint down with it
+                    log.exception("Health server request failed")
+                    self._close(key.fileobj)
+            self._reap_idle()
+
+    def _accept(self):
+        try:
+            conn, _ = self.sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(False)
+        self._clients[conn] = [b"", time.monotonic() + _HEALTH_CLIENT_TIMEOUT_SEC]
+        self.selector.register(conn, selectors.EVENT_READ)
+
+    def _read(self, conn):
+        try:
+            chunk = conn.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._close(conn)
+            return
+        state = self._clients[conn]
+        state[0] += chunk
+        if b"\r\n\r\n" not in state[0]:
+            if len(state[0]) > _HEALTH_MAX_REQUEST_BYTES:
+                self._close(conn)
+            return
+        response = self._response_for(state[0])
+        try:
+            conn.setblocking(True)
+            conn.settimeout(2.0)
+            conn.sendall(response)
+        except OSError:
+            pass
+        self._close(conn)
+
+    def _reap_idle(self):
+        now = time.monotonic()
+        for conn, (_, deadline) in list(self._clients.items()):
+            if now > deadline:
+                self._close(conn)
+
+    def _close(self, conn):
+        self._clients.pop(conn, None)
+        try:
+            self.selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        conn.close()
+
+    def _response_for(self, request):
+        parts = request.split(b"\r\n", 1)[0].split()
+        if len(parts) < 2 or parts[0] != b"GET" or parts[1] != b"/health":
+            return _HEALTH_NOT_FOUND
+        now = time.monotonic()
+        if now >= self._cached_until:
+            body = _health_body(self.status())
+            self._cached_response = (
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: %d\r\n"
+                b"Connection: close\r\n\r\n" % len(body)
+            ) + body
+            self._cached_until = now + _HEALTH_CACHE_SEC
+        return self._cached_response
+
+    def status(self):
+        agent = self.agent
+        now = time.time()
+        status = {
+            "ok": True,
+            "bots": len(agent.bots) if agent else 0,
+            "uptime_s": round(now - agent._start_ts, 1) if agent else 0,
+            "actions_last_hour": len(agent.scheduler.action_timestamps) if agent else 0,
+            "videos_today": agent.scheduler.videos_today if agent else 0,
+        }
+        if agent:
+            status["bot_status"] = {
+                name: {
+                    "tier": brain.tier,
+                    "next_wake_in": max(0, round(brain.next_wake_ts - now)),
+                    "comments_1h": _comments_this_hour(name),
+                }
+                for name, brain in agent.bots.items()
+            }
+        return status
 
 
 # ---------------------------------------------------------------------------
@@ -2625,15 +3745,41 @@ class BoTTubeAgent:
         self.known_videos = set()
         self.known_comments = set()
         self._start_ts = time.time()
+        self._wake = threading.Event()
+        # Video generation (ComfyUI wait, ffmpeg, upload) runs here, one job
+        # at a time, so the main loop keeps serving the other bots meanwhile
+        self._video_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video")
+        self._video_job = None
+        self._smart_pool = ThreadPoolExecutor(max_workers=max(1, SMART_CYCLE_WORKERS),
+                                              thread_name_prefix="smart")
 
         signal.signal(signal.SIGTERM, self._shutdown)
         signal.signal(signal.SIGINT, self._shutdown)
 
     def _shutdown(self, signum, frame):
         log.info("Shutdown signal received (%s), persisting state...", signum)
-        for brain in self.bots.values():
-            brain.save_state()
+        _db_save_bot_states(self.bots.values())
         self.running = False
+        _stop_requested.set()
+        self.wake()
+
+    def wake(self):
+        """Cut the current main-loop sleep short (shutdown, external triggers)."""
+        self._wake.set()
+
+    def _sleep(self, seconds):
+        """Sleep up to `seconds`, returning early if wake() is called."""
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _next_sleep(self):
+        """Seconds until the next poll: the regular 30-90s poll interval, or
+        sooner if a bot is due to wake before then."""
+        poll_interval = random.uniform(30, 90)
+        if not self.bots:
+            return poll_interval
+        next_due = min(b.next_wake_ts for b in self.bots.values())
+        return max(1.0, min(poll_interval, next_due - time.time()))
 
     def init_bots(self):
         """Initialize all bot brains."""
@@ -2641,9 +3787,10 @@ class BoTTubeAgent:
             api_key = profile["api_key"]
 
             # Register bots that don't have keys yet
-            if not api_key and BoTTubeClient:
+            client_cls = _get_bottube_client_cls()
+            if not api_key and client_cls:
                 try:
-                    tmp_client = BoTTubeClient(base_url=BASE_URL)
+                    tmp_client = client_cls(base_url=BASE_URL)
                     result = tmp_client.register(name, display_name=profile["display"])
                     if isinstance(result, str):
                         api_key = result
@@ -2651,6 +3798,7 @@ class BoTTubeAgent:
                         api_key = result.get("api_key", "")
                     if api_key:
                         BOT_PROFILES[name]["api_key"] = api_key
+                        AUTH_HEADERS[name] = {"X-API-Key": api_key}
                         log.info("Registered new bot: %s", name)
                 except Exception as e:
                     log.warning("Could not register %s: %s", name, e)
@@ -2663,25 +3811,27 @@ class BoTTubeAgent:
                 name=name,
                 api_key=api_key,
                 display=profile["display"],
-                activity=profile["activity"],
+                activity=Activity[profile["activity"].upper()],
                 tier=profile.get("tier", "standard"),
                 interval_min=profile["base_interval_min"],
                 interval_max=profile["base_interval_max"],
                 video_prompts=profile["video_prompts"],
             )
 
-            # If no persisted wake time, stagger initial wakes
-            if brain.next_wake_ts < time.time():
-                brain.next_wake_ts = time.time() + random.uniform(30, 600)
+            # If no persisted wake time, give each bot a random phase within its
+            # own minimum interval so a cold start doesn't wake everyone at once
+            now = time.time()
+            if brain.next_wake_ts < now:
+                brain.next_wake_ts = now + random.uniform(30, brain.interval_min)
             # Clamp overly long wake times from stale DB / outlier Poisson values
-            elif brain.next_wake_ts > time.time() + brain.interval_max * 1.5:
-                brain.next_wake_ts = time.time() + random.uniform(
+            elif brain.next_wake_ts > now + brain.interval_max * 1.5:
+                brain.next_wake_ts = now + random.uniform(
                     brain.interval_min, brain.interval_max)
 
             self.bots[name] = brain
             log.info("Bot ready: %s (%s, tier=%s, wake in %.0fs)",
                      name, profile["activity"], brain.tier,
-                     brain.next_wake_ts - time.time())
+                     brain.next_wake_ts - now)
 
     def poll_new_activity(self):
         """Check for new videos and comments since last poll."""
@@ -2704,9 +3854,8 @@ class BoTTubeAgent:
                 vid = v.get("video_id", "")
                 if vid and vid not in self.known_videos:
                     self.known_videos.add(vid)
-                    _known_video_ids.add(vid)
-                    _db_track_video(vid)
                     new_videos.append(v)
+            _track_videos_from_response(new_videos)
         except Exception as e:
             log.debug("Feed poll failed: %s", e)
 
@@ -2716,20 +3865,24 @@ class BoTTubeAgent:
     def handle_new_video_reactions(self, videos):
         """Tier 2 bots react to new videos from other bots."""
         actions = []
+        # Tier and hourly quota don't depend on the video, so filter bots once
+        # (smart bots handle their own browsing)
+        reactors = [
+            (bot_name, brain) for bot_name, brain in self.bots.items()
+            if brain.tier == "standard" and brain.can_comment()
+        ]
+        if not reactors:
+            return actions
         for video in videos:
             vid_id = video.get("video_id", "")
             vid_agent = video.get("agent_name", "")
             vid_title = video.get("title", "")
 
-            for bot_name, brain in self.bots.items():
-                if brain.tier != "standard":
-                    continue  # Smart bots handle their own browsing
+            for bot_name, brain in reactors:
                 if bot_name == vid_agent:
                     continue
                 if brain.already_commented_on(vid_id):
                     continue
-                if not brain.can_comment():
-                    continue
                 if random.random() < 0.40:
                     actions.append(("react_video", bot_name, vid_id, vid_title, vid_agent))
 
@@ -2738,9 +3891,13 @@ class BoTTubeAgent:
     def spontaneous_actions(self):
         """Bots decide what to do when they wake up — tier-based action queues."""
         actions = []
+        woke = []
+        rand = random.random  # bound once; several draws per awake bot
+        now = time.time()
         for bot_name, brain in self.bots.items():
-            if not brain.is_awake():
+            if not brain.is_awake(now):
                 continue
+            woke.append(brain)
 
             # --- Special-purpose bots ---
             if bot_name == "the_daily_byte":
@@ -2764,40 +3921,115 @@ class BoTTubeAgent:
             elif brain.tier == "active":
                 actions.append(("check_notifications", bot_name))
                 actions.append(("browse_and_engage", bot_name))
-                if random.random() < 0.40:
+                if rand() < 0.40:
                     actions.append(("react_to_recent", bot_name))
 
             # --- Casual bots: lighter action queue ---
             elif brain.tier == "casual":
                 actions.append(("check_notifications", bot_name))
-                if random.random() < 0.60:
+                if rand() < 0.60:
                     actions.append(("browse_and_engage", bot_name))
-                if random.random() < 0.15:
+                if rand() < 0.15:
                     actions.append(("react_to_recent", bot_name))
 
             # --- Fallback (legacy "standard" tier if any remain) ---
             else:
-                if brain.can_comment() and random.random() < 0.50:
+                if brain.can_comment() and rand() < 0.50:
                     actions.append(("browse", bot_name))
 
             # Video generation (rare, non-smart tiers)
             if brain.tier not in ("smart",):
-                video_chance = {"high": 0.02, "medium": 0.01, "low": 0.003}.get(brain.activity, 0.01)
-                if random.random() < video_chance and self.scheduler.can_generate_video():
+                video_chance = ACTIVITY_VIDEO_CHANCE[brain.activity]
+                if rand() < video_chance and self.scheduler.can_generate_video():
                     actions.append(("generate_video", bot_name))
 
-            # Reschedule wake
-            interval = brain.schedule_next_wake()
-            log.debug("%s next wake in %.0f min", bot_name, interval / 60)
-
+        # Reschedule every bot that woke this pass in one batch
+        if woke:
+            schedule_wakes(woke)
         return actions
 
+    def _produce_video(self, bot_name):
+        """Generate and upload one video for bot_name (runs on the video worker).
+
+        Returns (bot_name, video_id or None). Bot and scheduler state is only
+        updated from the main thread, in _collect_video_job.
+        """
+        try:
+            return bot_name, self._generate_and_upload_video(bot_name)
+        except Exception as e:
+            log.error("[%s] Video job failed: %s", bot_name, e, exc_info=True)
+            return bot_name, None
+
+    def _collect_video_job(self):
+        """Apply a finished video job's upload to bot and scheduler state."""
+        job = self._video_job
+        if job is None or not job.done():
+            return
+        self._video_job = None
+        if job.cancelled():
+            return
+        bot_name, vid_id = job.result()
+        if vid_id:
+            brain = self.bots[bot_name]
+            brain.videos_uploaded += 1
+            brain.last_video_ts = time.time()
+            brain.record_action()
+            self.scheduler.record_action()
+            self.scheduler.record_video()
+            _db_record_action(bot_name, "upload", vid_id)
+
+    def _generate_and_upload_video(self, bot_name):
+        """ComfyUI video (ffmpeg text video as fallback), then upload.
+
+        Returns the new video_id, or None.
+        """
+        brain = self.bots[bot_name]
+        prompt = random.choice(brain.video_prompts)
+        log.info("[%s] Generating video: %s", bot_name, prompt[:60])
+
+        # Try ComfyUI first, fall back to ffmpeg text video
+        video_path = generate_video_comfyui(prompt, bot_name)
+        if not video_path and _stop_requested.is_set():
+            return None
+        if not video_path:
+            # Fallback: generate a text-based video using ffmpeg
+            titles = VIDEO_TITLES.get(bot_name, VIDEO_TITLES.get("sophia-elya", [("Video #{n}", "A video.")]))
+            title_tpl, desc_tpl = random.choice(titles)
+            n = brain.videos_uploaded + 1
+            title = title_tpl.replace("#{n}", f"#{n}")
+
+            # Generate text lines from title + prompt
+            text_lines = [title, prompt[:80], f"by {brain.display}"]
+            video_path = generate_text_video(text_lines)
+            if not video_path:
+                log.warning("[%s] Both ComfyUI and ffmpeg failed", bot_name)
+                return None
+
+        # Upload
+        titles = VIDEO_TITLES.get(bot_name, VIDEO_TITLES.get("sophia-elya", [("Video #{n}", "A video.")]))
+        title_tpl, desc_tpl = random.choice(titles)
+        n = brain.videos_uploaded + 1
+        title = title_tpl.replace("#{n}", f"#{n}")
+
+        vid_id = upload_video(
+            brain.client, bot_name, video_path, title, desc_tpl,
+            f"{bot_name},ai,generated,bottube"
+        )
+
+        # Cleanup
+        try:
+            os.unlink(video_path)
+        except OSError:
+            pass
+        return vid_id
+
     def execute_action(self, action):
         """Execute a single bot action."""
         action_type = action[0]
 
         # These action types bypass global rate limiting (they manage their own pacing)
-        bypass_rate_limit = ("smart_cycle", "news_cycle", "weather_cycle", "janitor_sweep", "check_notifications")
+        bypass_rate_limit = ("smart_cycle", "smart_batch", "news_cycle", "weather_cycle",
+                             "janitor_sweep", "check_notifications")
         if action_type not in bypass_rate_limit and not self.scheduler.can_act():
             log.debug("Global rate limit — skipping %s", action_type)
             return False
@@ -2852,6 +4084,11 @@ class BoTTubeAgent:
                 log.error("[%s] News cycle error: %s", bot_name, e)
                 return False
 
+        elif action_type == "smart_batch":
+            # Several smart cycles at once; their LLM turns overlap on the backend
+            _, cycles = action
+            return any(list(self._smart_pool.map(self.execute_action, cycles)))
+
         elif action_type == "smart_cycle":
             _, bot_name = action
             brain = self.bots[bot_name]
@@ -2923,52 +4160,13 @@ class BoTTubeAgent:
 
         elif action_type == "generate_video":
             _, bot_name = action
-            brain = self.bots[bot_name]
-            if not brain.client:
+            if not self.bots[bot_name].client:
                 return False
-            prompt = random.choice(brain.video_prompts)
-            log.info("[%s] Generating video: %s", bot_name, prompt[:60])
-
-            # Try ComfyUI first, fall back to ffmpeg text video
-            video_path = generate_video_comfyui(prompt, bot_name)
-            if not video_path:
-                # Fallback: generate a text-based video using ffmpeg
-                titles = VIDEO_TITLES.get(bot_name, VIDEO_TITLES.get("sophia-elya", [("Video #{n}", "A video.")]))
-                title_tpl, desc_tpl = random.choice(titles)
-                n = brain.videos_uploaded + 1
-                title = title_tpl.replace("#{n}", f"#{n}")
-
-                # Generate text lines from title + prompt
-                text_lines = [title, prompt[:80], f"by {brain.display}"]
-                video_path = generate_text_video(text_lines)
-                if not video_path:
-                    log.warning("[%s] Both ComfyUI and ffmpeg failed", bot_name)
-                    return False
-
-            # Upload
-            titles = VIDEO_TITLES.get(bot_name, VIDEO_TITLES.get("sophia-elya", [("Video #{n}", "A video.")]))
-            title_tpl, desc_tpl = random.choice(titles)
-            n = brain.videos_uploaded + 1
-            title = title_tpl.replace("#{n}", f"#{n}")
-
-            vid_id = upload_video(
-                brain.client, bot_name, video_path, title, desc_tpl,
-                f"{bot_name},ai,generated,bottube"
-            )
-            if vid_id:
-                brain.videos_uploaded += 1
-                brain.last_video_ts = time.time()
-                brain.record_action()
-                self.scheduler.record_action()
-                self.scheduler.record_video()
-                _db_record_action(bot_name, "upload", vid_id)
-
-            # Cleanup
-            try:
-                os.unlink(video_path)
-            except OSError:
-                pass
-            return vid_id is not None
+            if self._video_job is not None and not self._video_job.done():
+                log.debug("[%s] Video job already running, skipping", bot_name)
+                return False
+            self._video_job = self._video_pool.submit(self._produce_video, bot_name)
+            return True
 
         elif action_type == "check_notifications":
             _, bot_name = action
@@ -2991,7 +4189,7 @@ class BoTTubeAgent:
                     notif_id = notif.get("id", 0)
                     if _db_already_replied_to_comment(bot_name, notif_id):
                         continue
-                    if _db_comments_this_hour(bot_name) >= MAX_COMMENTS_PER_BOT_PER_HOUR:
+                    if _comments_this_hour(bot_name) >= MAX_COMMENTS_PER_BOT_PER_HOUR:
                         break
                     from_agent = notif.get("from_agent", "someone")
                     comment_text = notif.get("message", "")
@@ -3084,11 +4282,10 @@ class BoTTubeAgent:
             try:
                 result = brain.client.recent_comments(limit=20)
                 comments = result.get("comments", []) if isinstance(result, dict) else result
-                bot_names = set(BOT_PROFILES.keys())
                 candidates = [
                     c for c in comments
                     if c.get("agent_name") != bot_name
-                    and c.get("agent_name") in bot_names
+                    and c.get("agent_name") in _BOT_NAME_SET
                     and not _db_already_replied_to_comment(bot_name, c.get("id", 0))
                     and _db_bots_on_video(c.get("video_id", "")) < MAX_BOTS_PER_VIDEO
                     and _db_reply_chain_depth(bot_name, c.get("agent_name", ""), c.get("video_id", "")) < MAX_REPLY_CHAIN_DEPTH
@@ -3130,9 +4327,9 @@ class BoTTubeAgent:
 
         # Start health endpoint
         try:
-            HealthHandler.agent_ref = self
-            health_server = HTTPServer(("0.0.0.0", HEALTH_PORT), HealthHandler)
-            threading.Thread(target=health_server.serve_forever, daemon=True).start()
+            health_server = HealthServer(self, "0.0.0.0", HEALTH_PORT)
+            threading.Thread(target=health_server.serve_forever, daemon=True,
+                             name="health").start()
             log.info("Health endpoint started on port %d", HEALTH_PORT)
         except Exception as e:
             log.warning("Could not start health endpoint: %s", e)
@@ -3159,8 +4356,13 @@ class BoTTubeAgent:
                 # 3. Execute actions with natural delays
                 if actions:
                     # Janitor/smart/news/weather cycles first, then reactions, then browse/video
-                    _priority_types = ("janitor_sweep", "smart_cycle", "news_cycle", "weather_cycle")
+                    _priority_types = ("janitor_sweep", "smart_cycle", "smart_batch",
+                                       "news_cycle", "weather_cycle")
                     priority = [a for a in actions if a[0] in _priority_types]
+                    smart = [a for a in priority if a[0] == "smart_cycle"]
+                    if len(smart) > 1 and SMART_CYCLE_WORKERS > 1:
+                        priority = [a for a in priority if a[0] != "smart_cycle"]
+                        priority.append(("smart_batch", smart))
                     other = [a for a in actions if a[0] not in _priority_types]
                     random.shuffle(other)
                     ordered = priority + other
@@ -3176,7 +4378,10 @@ class BoTTubeAgent:
                         if success:
                             delay = random.uniform(MIN_ACTION_GAP_SEC, MIN_ACTION_GAP_SEC * 3)
                             log.debug("Sleeping %.0fs between actions", delay)
-                            time.sleep(delay)
+                            self._sleep(delay)
+
+                self._collect_video_job()
+                _flush_dirty_bots(self.bots.values())
 
                 # 4. Status log every 20 cycles
                 if cycle % 20 == 0:
@@ -3184,17 +4389,24 @@ class BoTTubeAgent:
                              cycle, len(self.scheduler.action_timestamps),
                              self.scheduler.videos_today)
 
-                # 5. Sleep before next poll
-                poll_interval = random.uniform(30, 90)
-                time.sleep(poll_interval)
+                # 5. Sleep until the next poll or the next bot wake, whichever is first
+                self._sleep(self._next_sleep())
 
             except Exception as e:
                 log.error("Error in main loop: %s", e, exc_info=True)
-                time.sleep(60)
-
-        # Persist state on shutdown
-        for brain in self.bots.values():
-            brain.save_state()
+                self._sleep(60)
+
+        # Persist before waiting on workers: a systemd stop timeout may
+        # SIGKILL us while an upload or LLM call is still finishing
+        _db_save_bot_states(self.bots.values())
+        _flush_pending_actions()
+        _stop_requested.set()
+        self._video_pool.shutdown(wait=True, cancel_futures=True)
+        self._smart_pool.shutdown(wait=True, cancel_futures=True)
+        # Pick up whatever the workers finished meanwhile
+        self._collect_video_job()
+        _db_save_bot_states(self.bots.values())
+        _flush_pending_actions()
         log.info("Agent daemon stopped gracefully.")
 
 
@@ -3202,40 +4414,202 @@ class BoTTubeAgent:
 # Bot avatar generation
 # ---------------------------------------------------------------------------
 
-def _generate_avatar_image(bot_name: str, display_name: str) -> str:
-    """Generate a unique avatar image using ffmpeg.
-
-    Returns path to generated PNG file (caller must delete after upload).
-    Uses hash-derived HSL color (same algorithm as server's SVG fallback).
-    """
-    h = hashlib.md5(bot_name.encode()).hexdigest()
-    hue = int(h[:3], 16) % 360
-    sat = 55 + int(h[3:5], 16) % 30
-    light = 45 + int(h[5:7], 16) % 15
-
-    # Convert HSL to RGB hex for ffmpeg
-    # Simplified HSL->RGB: use full saturation approximation
-    import colorsys
-    r, g, b = colorsys.hls_to_rgb(hue / 360, light / 100, sat / 100)
-    bg_hex = f"{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+_AVATAR_SIZE = 256
+AVATAR_WORKERS = 8  # concurrent avatar check/upload requests (within _http_adapter's pool)
+_AVATAR_FFMPEG_BATCH = 32  # avatars per ffmpeg process when Pillow is missing
+_AVATAR_DRAWTEXT = "drawtext=text='{}':fontsize=140:fontcolor=white:x=(w-tw)/2:y=(h-th)/2-10"
 
-    initial = (display_name[0] if display_name else bot_name[0]).upper()
 
-    # Generate avatar with ffmpeg: colored background + white initial
-    out_path = f"/tmp/avatar_{bot_name}_{int(time.time())}.png"
+@functools.lru_cache(maxsize=1)
+def _avatar_font():
+    """Pillow font for avatar initials: FONT_PATH if set, else the built-in."""
+    if FONT_PATH:
+        try:
+            return ImageFont.truetype(FONT_PATH, 140)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size=140)
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font only
+        return ImageFont.load_default()
+
+
+def _render_avatar_pillow(rgb, initial):
+    """Draw the avatar in-process: solid background, centered white initial."""
+    img = Image.new("RGB", (_AVATAR_SIZE, _AVATAR_SIZE), rgb)
+    draw = ImageDraw.Draw(img)
+    font = _avatar_font()
+    left, top, right, bottom = draw.textbbox((0, 0), initial, font=font)
+    # Same placement as the ffmpeg drawtext: x=(w-tw)/2, y=(h-th)/2-10
+    x = (_AVATAR_SIZE - (right - left)) // 2 - left
+    y = (_AVATAR_SIZE - (bottom - top)) // 2 - 10 - top
+    draw.text((x, y), initial, fill="white", font=font)
+    return img
+
+
+def _hsl_to_rgb_int(hue, sat, light):
+    """HSL (degrees, percent, percent) to 0-255 RGB in exact integer math.
+
+    Standard sector formula with every term scaled by 120 * 100 * 100 so
+    nothing is fractional until the final floor division. Matches
+    int(colorsys.hls_to_rgb(...) * 255) except where the float version
+    lands a hair under a whole channel value.
+    """
+    span = (100 - abs(2 * light - 100)) * sat  # chroma, x100x100
+    c = span * 120
+    x = span * 2 * (60 - abs(hue % 120 - 60))
+    m = light * 12000 - span * 60
+    r, g, b = ((c, x, 0), (x, c, 0), (0, c, x),
+               (0, x, c), (x, 0, c), (c, 0, x))[hue // 60]
+    return (255 * (r + m) // 1200000, 255 * (g + m) // 1200000,
+            255 * (b + m) // 1200000)
+
+
+def _avatar_rgb(bot_name: str) -> tuple:
+    """Background color for bot_name as an (r, g, b) tuple of 0-255 ints.
+
+    MD5 is kept (not for security) because the server derives its SVG
+    fallback colors from the same digest; the fields are read as bits of
+    the first four digest bytes instead of slicing and parsing hexdigest().
+    """
+    digest = hashlib.md5(bot_name.encode(), usedforsecurity=False).digest()
+    n = int.from_bytes(digest[:4], "big")
+    hue = (n >> 20) % 360               # hex digits 0-2
+    sat = 55 + ((n >> 12) & 0xFF) % 30  # hex digits 3-4
+    light = 45 + ((n >> 4) & 0xFF) % 15  # hex digits 5-6
+    return _hsl_to_rgb_int(hue, sat, light)
+
+
+def _avatar_png(bot_name, initial):
+    """Render the avatar PNG for bot_name with the given initial."""
+    if Image is not None:
+        buf = io.BytesIO()
+        # Fast level-1 deflate: flat-color 256x256 PNGs stay tiny anyway
+        _render_avatar_pillow(_avatar_rgb(bot_name), initial).save(buf, "PNG", compress_level=1)
+        return buf.getvalue()
+
+    # Generate avatar with ffmpeg: colored background + white initial,
+    # one PNG frame written to stdout
     cmd = [
         "ffmpeg", "-y",
-        "-f", "lavfi", "-i", f"color=c=0x{bg_hex}:s=256x256:d=1",
-        "-vf", f"drawtext=text='{initial}':fontsize=140:fontcolor=white:x=(w-tw)/2:y=(h-th)/2-10",
+        *_avatar_color_input(bot_name),
+        "-vf", _AVATAR_DRAWTEXT.format(_ffmpeg_initial(initial)),
         "-frames:v", "1",
-        out_path
+        "-f", "image2pipe", "-c:v", "png", "pipe:1",
     ]
+    return subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, timeout=15, check=True).stdout
+
+
+def _avatar_initial(bot_name, display_name):
+    """The letter drawn on a bot's avatar."""
+    return (display_name[0] if display_name else bot_name[0]).upper()
+
+
+def _ffmpeg_initial(initial):
+    """Only [A-Z0-9] go into a drawtext filter string; quotes, colons and
+    backslashes would break its parsing."""
+    return initial if initial.isascii() and initial.isalnum() else "?"
+
+
+def _avatar_color_input(bot_name):
+    """ffmpeg lavfi input args for one avatar's solid background."""
+    return ["-f", "lavfi", "-i", "color=c=0x%02x%02x%02x:s=256x256:d=1" % _avatar_rgb(bot_name)]
+
+
+def _render_avatars_ffmpeg(todo):
+    """Render avatars for (bot_name, display_name) pairs with one ffmpeg run
+    per _AVATAR_FFMPEG_BATCH bots, instead of one process per bot.
+
+    Returns {bot_name: png_bytes}; bots missing from it (a failed batch)
+    fall back to _generate_avatar_image.
+    """
+    pngs = {}
+    for start in range(0, len(todo), _AVATAR_FFMPEG_BATCH):
+        batch = todo[start:start + _AVATAR_FFMPEG_BATCH]
+        with tempfile.TemporaryDirectory(prefix="bottube-avatars-") as tmp:
+            cmd = ["ffmpeg", "-y"]
+            for name, _ in batch:
+                cmd += _avatar_color_input(name)
+            cmd += ["-filter_complex", ";".join(
+                f"[{i}:v]{_AVATAR_DRAWTEXT.format(_ffmpeg_initial(_avatar_initial(name, display)))}[a{i}]"
+                for i, (name, display) in enumerate(batch)
+            )]
+            for i in range(len(batch)):
+                cmd += ["-map", f"[a{i}]", "-frames:v", "1", f"{tmp}/{i}.png"]
+            try:
+                subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=60, check=True)
+                for i, (name, _) in enumerate(batch):
+                    pngs[name] = Path(f"{tmp}/{i}.png").read_bytes()
+            except Exception as e:
+                log.warning("Batch avatar render failed (%d bots): %s", len(batch), e)
+    return pngs
+
+
+def _generate_avatar_image(bot_name: str, display_name: str) -> bytes:
+    """Generate a unique avatar image (Pillow when installed, else ffmpeg).
+
+    Returns the PNG bytes (b"" on failure); nothing is written to disk.
+    Uses hash-derived HSL color (same algorithm as server's SVG fallback).
+    """
+    initial = _avatar_initial(bot_name, display_name)
     try:
-        subprocess.run(cmd, capture_output=True, timeout=15, check=True)
-        return out_path
+        return _avatar_png(bot_name, initial)
     except Exception as e:
         log.warning("Failed to generate avatar for %s: %s", bot_name, e)
-        return ""
+        return b""
+
+
+def _avatar_needed(name):
+    """Ask the server whether bot name still needs an avatar.
+
+    Returns its display name if so, else None.
+    """
+    try:
+        resp = _http_session.get(
+            f"{BASE_URL}/api/agents/{name}",
+            timeout=10,
+            verify=False,
+        )
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        avatar = data.get("agent", {}).get("avatar_url", "")
+        # Skip if already has an uploaded avatar (not SVG fallback)
+        if avatar and "/avatars/" in avatar:
+            _db_record_avatar(name)
+            return None
+        return data.get("agent", {}).get("display_name", name)
+    except Exception as e:
+        log.warning("Avatar check failed for %s: %s", name, e)
+        return None
+
+
+def _provision_avatar(name, display_name, png=None):
+    """Upload an avatar for one bot, generating it first unless png is given."""
+    try:
+        if not png:
+            png = _generate_avatar_image(name, display_name)
+        if not png:
+            return
+
+        # Upload the generated avatar straight from memory
+        up = _http_session.post(
+            f"{BASE_URL}/api/agents/me/avatar",
+            headers=AUTH_HEADERS[name],
+            files={"avatar": (f"{name}.png", png, "image/png")},
+            timeout=30,
+            verify=False,
+        )
+        if up.status_code == 200:
+            new_url = up.json().get("avatar_url", "")
+            log.info("Avatar generated for %s → %s", name, new_url)
+            _db_record_avatar(name)
+        else:
+            log.warning("Avatar upload failed for %s: %s", name, up.text[:200])
+    except Exception as e:
+        log.warning("Avatar upload failed for %s: %s", name, e)
 
 
 def _ensure_bot_avatars(agent: "BoTTubeAgent"):
@@ -3243,51 +4617,21 @@ def _ensure_bot_avatars(agent: "BoTTubeAgent"):
 
     Each bot can later upload its own custom image via POST /api/agents/me/avatar.
     This function only fills in bots that still have the default SVG or empty avatar.
+    Bots are independent, so their checks and uploads run on a small thread pool.
+    Bots recorded in bot_avatars are skipped without asking the server.
     """
-    for name, brain in agent.bots.items():
-        if not brain.api_key:
-            continue
-        try:
-            resp = requests.get(
-                f"{BASE_URL}/api/agents/{name}",
-                timeout=10,
-                verify=False,
-            )
-            if resp.status_code != 200:
-                continue
-            data = resp.json()
-            avatar = data.get("agent", {}).get("avatar_url", "")
-            # Skip if already has an uploaded avatar (not SVG fallback)
-            if avatar and "/avatars/" in avatar:
-                continue
-
-            # Generate avatar image locally
-            display_name = data.get("agent", {}).get("display_name", name)
-            img_path = _generate_avatar_image(name, display_name)
-            if not img_path or not Path(img_path).exists():
-                continue
-
-            # Upload the generated avatar
-            try:
-                with open(img_path, "rb") as f:
-                    up = requests.post(
-                        f"{BASE_URL}/api/agents/me/avatar",
-                        headers={"X-API-Key": brain.api_key},
-                        files={"avatar": (f"{name}.png", f, "image/png")},
-                        timeout=30,
-                        verify=False,
-                    )
-                if up.status_code == 200:
-                    new_url = up.json().get("avatar_url", "")
-                    log.info("Avatar generated for %s → %s", name, new_url)
-                else:
-                    log.warning("Avatar upload failed for %s: %s", name, up.text[:200])
-            finally:
-                # Clean up temp file
-                if Path(img_path).exists():
-                    Path(img_path).unlink()
-        except Exception as e:
-            log.warning("Avatar check failed for %s: %s", name, e)
+    done = _db_avatar_bots()
+    names = [name for name, brain in agent.bots.items()
+             if brain.api_key and name not in done]
+    if not names:
+        return
+    with ThreadPoolExecutor(max_workers=min(AVATAR_WORKERS, len(names)),
+                            thread_name_prefix="avatar") as pool:
+        todo = [(name, display) for name, display in zip(names, pool.map(_avatar_needed, names))
+                if display is not None]
+        # Without Pillow, render every missing avatar in as few ffmpeg runs as possible
+        pngs = _render_avatars_ffmpeg(todo) if Image is None and len(todo) > 1 else {}
+        list(pool.map(lambda item: _provision_avatar(*item, pngs.get(item[0])), todo))
 
 
 # ---------------------------------------------------------------------------
@@ -3300,8 +4644,11 @@ def main():
     agent = BoTTubeAgent()
     agent.init_bots()
 
-    # Generate avatars for bots that don't have one
-    _ensure_bot_avatars(agent)
+    # Generate avatars for bots that don't have one. Pure network I/O, so it
+    # runs in the background instead of holding up warmup and the first poll.
+    avatars = threading.Thread(target=_ensure_bot_avatars, args=(agent,),
+                               daemon=True, name="avatars")
+    avatars.start()
 
     # Warm up LLM (preloads model into memory before smart bots wake)
     _warmup_llm()
@@ -3315,6 +4662,10 @@ def main():
             actions.extend(agent.handle_new_video_reactions(new_videos))
         for action in actions[:3]:
             agent.execute_action(action)
+        avatars.join()
+        # run() normally persists these each cycle and at shutdown
+        _flush_dirty_bots(agent.bots.values())
+        _flush_pending_actions()
         return
 
     agent.run()
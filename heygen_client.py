@@ -34,6 +34,8 @@ class HeyGenClient:
         self.base_url = "https://api.heygen.com"
         if not self.api_key:
             raise HeyGenError("HeyGen API key required")
+        # Reused across submit/poll/download so status polls keep one connection
+        self.session = requests.Session()
 
     def _headers(self):
         return {
@@ -43,7 +45,7 @@ class HeyGenClient:
 
     def list_avatars(self):
         """List available avatars."""
-        r = requests.get(
+        r = self.session.get(
             f"{self.base_url}/v2/avatars",
             headers=self._headers(),
             timeout=DEFAULT_TIMEOUT,
@@ -54,7 +56,7 @@ class HeyGenClient:
 
     def list_voices(self):
         """List available voices."""
-        r = requests.get(
+        r = self.session.get(
             f"{self.base_url}/v2/voices",
             headers=self._headers(),
             timeout=DEFAULT_TIMEOUT,
@@ -86,7 +88,7 @@ class HeyGenClient:
             "dimension": {"width": width, "height": height},
         }
 
-        r = requests.post(
+        r = self.session.post(
             f"{self.base_url}/v2/video/generate",
             headers=self._headers(),
             json=payload,
@@ -113,7 +115,7 @@ class HeyGenClient:
         """
         deadline = time.time() + timeout
         while time.time() < deadline:
-            r = requests.get(
+            r = self.session.get(
                 f"{self.base_url}/v1/video_status.get",
                 headers=self._headers(),
                 params={"video_id": video_id},
@@ -144,7 +146,7 @@ class HeyGenClient:
 
         Returns the output path.
         """
-        r = requests.get(video_url, stream=True, timeout=60)
+        r = self.session.get(video_url, stream=True, timeout=60)
         r.raise_for_status()
         with open(output_path, "wb") as f:
             for chunk in r.iter_content(chunk_size=65536):
@@ -25,6 +25,11 @@ RSS_FEEDS = [
 # Max age for a story to be considered "fresh" (6 hours)
 MAX_STORY_AGE_SEC = 6 * 3600
 
+# Per-feed validators from the last 200 response, reused as If-None-Match /
+# If-Modified-Since so unchanged feeds come back as a bodiless 304.
+# url -> {"etag": ..., "modified": ..., "entries": [...]}
+_feed_cache = {}
+
 
 def _story_hash(title):
     """Deterministic hash for deduplication."""
@@ -35,6 +40,22 @@ class NewsFetcher:
     def __init__(self, feeds=None):
         self.feeds = feeds or RSS_FEEDS
 
+    @staticmethod
+    def _fetch_entries(url):
+        """Fetch a feed's entries with a conditional GET, reusing the cached
+        entries when the server answers 304 Not Modified."""
+        cached = _feed_cache.get(url)
+        if cached:
+            d = feedparser.parse(url, etag=cached["etag"], modified=cached["modified"])
+            if d.get("status") == 304:
+                return cached["entries"]
+        else:
+            d = feedparser.parse(url)
+        etag, modified = d.get("etag"), d.get("modified")
+        if etag or modified:
+            _feed_cache[url] = {"etag": etag, "modified": modified, "entries": d.entries}
+        return d.entries
+
     def fetch_headlines(self, max_items=10):
         """Fetch headlines from all feeds.
 
@@ -46,8 +67,8 @@ class NewsFetcher:
 
         for feed_info in self.feeds:
             try:
-                d = feedparser.parse(feed_info["url"])
-                for entry in d.entries[:max_items]:
+                entries = self._fetch_entries(feed_info["url"])
+                for entry in entries[:max_items]:
                     title = entry.get("title", "").strip()
                     if not title:
                         continue
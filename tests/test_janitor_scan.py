@@ -0,0 +1,94 @@
+import pathlib
+import random
+import re
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import bottube_autonomous_agent as agent  # noqa: E402
+
+# The original single-regex scanner; every optimized path must give the
+# same verdict for every input.
+BASELINE_BLOCKLIST = [
+    r"\bcsam\b", r"\bchild\s*(porn|sex|exploit|abuse)", r"\bpedophil",
+    r"\bjailbait\b", r"\bloli\b", r"\bshota\b", r"\bunderage\s*(sex|nude|porn)",
+    r"\bminor\s*(sex|nude|porn)", r"\bisis\b", r"\bal[- ]?qaeda\b",
+    r"\bjihad\s*(training|manual|recruit)", r"\bbehead(ing)?\b",
+    r"\bterror(ist)?\s*(manual|recruit|attack\s*plan)", r"\bbomb\s*making\b",
+    r"\bsynthe(size|sis)\s*(meth|fentanyl|sarin|ricin|vx)\b",
+    r"\bnapalm\s*recipe\b", r"\bweaponiz", r"\bdoxx(ing|ed)?\b",
+    r"\bswatt(ing|ed)?\b", r"\bpersonal\s*info.*leak", r"\breal\s*gore\b",
+    r"\bcrush\s*fetish\b", r"\banimal\s*torture\b", r"\bsnuff\b",
+    r"\brape\s*(porn|video|fantasy)", r"\brevenge\s*porn\b",
+]
+BASELINE = re.compile("|".join(BASELINE_BLOCKLIST), re.IGNORECASE)
+
+WORDS = [
+    "csam", "CSAM", "xcsam", "csamx", "child porn", "childsex", "pedophile",
+    "Pedophilia", "jailbait", "loli", "lolita", "shota", "underage nude",
+    "minor  porn", "isis", "ISIS", "crisis", "al-qaeda", "alqaeda", "al qaeda",
+    "jihad manual", "beheading", "beheaded", "behead", "terrorist attack plan",
+    "bomb making", "synthesize meth", "synthesis vx", "napalm recipe",
+    "weaponized", "reweaponize", "doxxing", "doxxed", "swatting",
+    "personal info was leak", "personal info\nleak", "real gore", "Real  Gore",
+    "crush fetish", "animal torture", "snuff", "snuffy", "rape video",
+    "revenge porn", "AL-QAEDA", "_isis", "isis_",
+    # Non-ASCII case variants: re.IGNORECASE treats these as i/s/k, but
+    # str.casefold()/lower() either keep them or change the string length
+    "chıld porn", "pedophıle", "jaılbaıt", "mınor nude", "jıhad training",
+    "ıSIS", "İsis", "ISİS", "weaponız", "ſnuff", "snuﬀ", "İİ isis", "ßnuff",
+    "crush fetıſh", "revenge pOrn", "señor", "café", "naïve",
+    "hello", "world", "cats", "",
+]
+
+
+def _phrases(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4)))
+        yield rng.choice(["", ".", "a", "_", "İ", "ı"]) + text + rng.choice(["", "!", "x", "ı"])
+
+
+def _mismatches(scan, count=20000, seed=1):
+    bad = []
+    for text in _phrases(count, seed):
+        ok, _ = scan(text)
+        if ok != (BASELINE.search(text) is None):
+            bad.append(text)
+    return bad
+
+
+def test_scan_matches_baseline_regex():
+    assert _mismatches(agent._janitor_scan_content)[:5] == []
+
+
+def test_trie_pattern_matches_baseline_regex():
+    def scan(text):
+        return agent._JANITOR_PATTERN.search(text) is None, None
+    assert _mismatches(scan, seed=2)[:5] == []
+
+
+def test_automaton_path_matches_baseline_regex():
+    pytest.importorskip("ahocorasick")
+    assert agent._JANITOR_AUTOMATON is not None
+    agent._janitor_scan_text.cache_clear()
+    assert _mismatches(agent._janitor_scan_content, seed=3)[:5] == []
+
+
+@pytest.mark.parametrize("text", [
+    "chıld porn", "pedophıle stuff", "jaılbaıt", "mınor nude",
+    "jıhad training", "ıSIS", "İsis", "weaponız", "ſnuff",
+])
+def test_dotted_and_dotless_i_variants_are_flagged(text):
+    assert BASELINE.search(text)
+    ok, term = agent._janitor_scan_content(text)
+    assert not ok and term
+
+
+@pytest.mark.parametrize("text", [None, "", "isi", "hello world", "crisis talks"])
+def test_clean_text_passes(text):
+    assert agent._janitor_scan_content(text) == (True, None)
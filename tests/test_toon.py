@@ -0,0 +1,140 @@
+import json
+import pathlib
+import sys
+from collections import defaultdict
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import bottube_autonomous_agent as agent  # noqa: E402
+
+
+@pytest.mark.parametrize("value", [
+    "a,b", 'say "hi"', "line one\nline two", "tab\there", "- not a list item",
+    "-", "key: value", "[1]", "{x}", "back\\slash", " padded", "padded ",
+    "", "42", "-3.5", "1e10", "true", "False", "null",
+    ".5", "+5", "1.", "+.5e-3", "Infinity", "-inf", "NaN",
+])
+def test_ambiguous_strings_are_quoted(value):
+    encoded = agent._toon_dumps({"v": value})
+    assert encoded == "v: " + json.dumps(value, ensure_ascii=False)
+    assert json.loads(encoded[len("v: "):]) == value
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("hello world", "hello world"),
+    ("café", "café"),
+    ("v2.0-beta", "v2.0-beta"),
+    (42, "42"),
+    (-3.5, "-3.5"),
+    (True, "true"),
+    (False, "false"),
+    (None, "null"),
+])
+def test_plain_values_are_bare(value, expected):
+    assert agent._toon_dumps({"v": value}) == "v: " + expected
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_floats_are_null(value):
+    assert agent._toon_dumps({"v": value}) == "v: null"
+
+
+def test_nested_objects_are_indented():
+    assert agent._toon_dumps({"video": {"id": "abc", "stats": {"views": 3}}}) == (
+        "video:\n"
+        "  id: abc\n"
+        "  stats:\n"
+        "    views: 3"
+    )
+
+
+def test_uniform_flat_records_are_tabular():
+    result = {"videos": [
+        {"id": "a1", "title": "Cats, again", "views": 10},
+        {"id": "b2", "title": "Dogs", "views": 0},
+    ]}
+    assert agent._toon_dumps(result) == (
+        "videos[2]{id,title,views}:\n"
+        '  a1,"Cats, again",10\n'
+        "  b2,Dogs,0"
+    )
+
+
+def test_primitive_arrays_are_inline():
+    assert agent._toon_dumps({"tags": ["a", "b,c", 3]}) == 'tags[3]: a,"b,c",3'
+
+
+def test_empty_array():
+    assert agent._toon_dumps({"tags": []}) == "tags[0]:"
+
+
+@pytest.mark.parametrize("items", [
+    [{"id": "a"}, {"id": "b", "extra": 1}],          # differing keys
+    [{"id": "a", "meta": {"x": 1}}, {"id": "b", "meta": {"x": 2}}],  # nested value
+    [{"id": "a"}, "loose"],                          # mixed kinds
+])
+def test_non_uniform_arrays_use_list_form(items):
+    lines = agent._toon_dumps({"items": items}).split("\n")
+    assert lines[0] == f"items[{len(items)}]:"
+    assert lines[1].startswith("  - id: a")
+
+
+def test_list_form_nests_objects_and_arrays():
+    result = {"items": [{"id": "a", "meta": {"x": 1}}, [1, 2], "loose"]}
+    assert agent._toon_dumps(result) == (
+        "items[3]:\n"
+        "  - id: a\n"
+        "    meta:\n"
+        "      x: 1\n"
+        "  - [2]: 1,2\n"
+        "  - loose"
+    )
+
+
+class _FakeClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def trending(self):
+        if self.fail:
+            raise RuntimeError("backend down")
+        return {"trending": []}
+
+
+def _dispatch(name, args=None, client=None):
+    return agent.dispatch_smart_tool(client or _FakeClient(), "bot", name,
+                                     args or {}, defaultdict(set))
+
+
+def test_dispatch_ok():
+    status, result = _dispatch("browse_trending")
+    assert status == "ok"
+    assert result["count"] == 0
+    assert agent._encode_tool_result(status, result) == agent._toon_dumps(result)
+
+
+@pytest.mark.parametrize("name, args, client", [
+    ("no_such_tool", None, None),
+    ("browse_trending", None, _FakeClient(fail=True)),
+    ("watch_video", {"video_id": "../etc"}, None),
+])
+def test_dispatch_error_is_json(name, args, client):
+    status, result = _dispatch(name, args, client)
+    assert status == "error"
+    assert "error" in result
+    assert json.loads(agent._encode_tool_result(status, result)) == result
+
+
+def test_dispatch_done():
+    status, result = _dispatch("done_for_now", {"reason": "tired"})
+    assert status == "done"
+    assert result == {"done": True, "reason": "tired"}
+
+
+def test_dispatch_ignores_non_dict_args():
+    status, _ = _dispatch("done_for_now", ["bogus"])
+    assert status == "done"